@@ -0,0 +1,470 @@
+"""Offline benchmarks for the scraper against a local replay server.
+
+The server serves either synthetic fixtures (a lazily loading companies
+listing, /jobs pages and job detail pages with JSON-LD) or recorded pages
+from a directory. Each stage is run at every requested scale and the
+throughput, per-page latency percentiles and peak RSS are written as JSON.
+
+    python bench.py --scales 100,1000,5000 --stages scroll,parse,jobs-http
+    python bench.py --compare bench_results/old.json bench_results/new.json
+"""
+import os
+import sys
+import time
+import json
+import argparse
+import platform
+import subprocess
+import tempfile
+import threading
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+
+STAGES = ["scroll", "parse", "jobs-selenium", "jobs-http", "pipeline"]
+CARDS_PER_BATCH = 40
+
+
+# --- synthetic fixtures -------------------------------------------------------
+
+def _slug(i):
+    return f"company-{i:05d}"
+
+
+def _card_html(i):
+    city, state = [("San Francisco", "CA"), ("New York", "NY"), ("Austin", "TX")][i % 3]
+    return (
+        f'<a href="/companies/{_slug(i)}" style="display:block;height:80px">'
+        f'<span class="_coName_i9oky_470">Company {i}</span>'
+        f'<div class="mb-1.5 text-sm"><span>Synthetic company number {i}</span></div>'
+        f'<span class="_coLocation_i9oky_486">{city}, {state}, USA</span>'
+        f"</a>"
+    )
+
+
+_LISTING_TEMPLATE = """<!doctype html>
+<html><head><title>Companies</title></head><body>
+<button>Filters</button>
+<label><input type="checkbox" name="isHiring"> Is Hiring</label>
+<label><input type="checkbox"><span>America / Canada</span></label>
+<label><input type="checkbox"><span>United States of America</span></label>
+<div id="list"></div>
+<script>
+let offset = 0, loading = false, done = false;
+async function more() {
+    if (loading || done) return;
+    loading = true;
+    const r = await fetch(`/api/cards?offset=${offset}&limit=%(batch)d`);
+    const cards = await r.json();
+    const list = document.getElementById("list");
+    for (const html of cards) list.insertAdjacentHTML("beforeend", html);
+    offset += cards.length;
+    done = cards.length === 0;
+    loading = false;
+}
+window.addEventListener("scroll", () => {
+    if (window.innerHeight + window.scrollY >= document.body.scrollHeight - 400) more();
+});
+more();
+</script>
+</body></html>
+"""
+
+
+def _jobs_page_html(i, jobs_per_company):
+    titles = ["Backend Engineer", "Product Designer", "Frontend Developer", "Account Executive"]
+    rows = []
+    for j in range(jobs_per_company):
+        rows.append(
+            '<div class="flex w-full flex-row justify-between py-4">'
+            f'<div><a href="/companies/{_slug(i)}/jobs/{j}-role">{titles[j % len(titles)]}</a>'
+            '<div class="justify-left flex flex-row flex-wrap gap-x-2 gap-y-0 pr-2">'
+            "<div>San Francisco, CA, US</div><div>$120K - $180K</div><div>3+ years</div>"
+            "</div></div>"
+            '<div class="APPLY"><a href="#">Apply Now</a></div>'
+            "</div>"
+        )
+    return f"<!doctype html><html><body><h1>Company {i} jobs</h1>{''.join(rows)}</body></html>"
+
+
+def _job_detail_html(i, j):
+    ld = {
+        "@context": "https://schema.org",
+        "@type": "JobPosting",
+        "title": f"Role {j}",
+        "datePosted": f"2025-{9 + j % 3:02d}-{1 + i % 28:02d}T00:00:00Z",
+        "hiringOrganization": {"@type": "Organization", "name": f"Company {i}"},
+    }
+    return (
+        "<!doctype html><html><head>"
+        f'<script type="application/ld+json">{json.dumps(ld)}</script>'
+        f"</head><body><h1>Role {j}</h1></body></html>"
+    )
+
+
+# --- replay server -------------------------------------------------------------
+
+class ReplayServer:
+    """Local HTTP server for synthetic fixtures (n_companies) or a recorded fixtures directory."""
+
+    def __init__(self, n_companies=100, jobs_per_company=4, latency_ms=0, fixtures_dir=None):
+        self.n_companies = n_companies
+        self.jobs_per_company = jobs_per_company
+        self.latency = latency_ms / 1000
+        self.fixtures_dir = fixtures_dir
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def companies_url(self):
+        return self.base_url + "/companies"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def route(self, path, query):
+        """Return (status, content_type, body) for a request path."""
+        if self.fixtures_dir:
+            return self._route_recorded(path)
+
+        parts = [p for p in path.split("/") if p]
+        if parts == ["companies"]:
+            return 200, "text/html", _LISTING_TEMPLATE % {"batch": CARDS_PER_BATCH}
+        if parts == ["api", "cards"]:
+            offset = int(query.get("offset", ["0"])[0])
+            limit = int(query.get("limit", [str(CARDS_PER_BATCH)])[0])
+            end = min(offset + limit, self.n_companies)
+            return 200, "application/json", json.dumps([_card_html(i) for i in range(offset, end)])
+        if len(parts) >= 3 and parts[0] == "companies" and parts[2] == "jobs" and parts[1].startswith("company-"):
+            i = int(parts[1].split("-")[1])
+            if i >= self.n_companies:
+                return 404, "text/plain", "not found"
+            if len(parts) == 3:
+                return 200, "text/html", _jobs_page_html(i, self.jobs_per_company)
+            if len(parts) == 4:
+                return 200, "text/html", _job_detail_html(i, int(parts[3].split("-")[0]))
+        return 404, "text/plain", "not found"
+
+    def _route_recorded(self, path):
+        rel = path.strip("/") or "index"
+        for candidate in (rel, rel + ".html", os.path.join(rel, "index.html")):
+            full = os.path.join(self.fixtures_dir, candidate)
+            if os.path.isfile(full):
+                ctype = "application/json" if full.endswith(".json") else "text/html"
+                with open(full, "r", encoding="utf-8") as f:
+                    return 200, ctype, f.read()
+        return 404, "text/plain", "not found"
+
+    def _handler(self):
+        replay = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                if replay.latency:
+                    time.sleep(replay.latency)
+                url = urlsplit(self.path)
+                status, ctype, body = replay.route(url.path, parse_qs(url.query))
+                data = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", f"{ctype}; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+# --- measurement ---------------------------------------------------------------
+
+def _process_tree_rss(root_pid):
+    """Resident memory in bytes of root_pid and all its descendants (Linux /proc)."""
+    children = {}
+    rss = {}
+    page = os.sysconf("SC_PAGE_SIZE")
+    for name in os.listdir("/proc"):
+        if not name.isdigit():
+            continue
+        try:
+            with open(f"/proc/{name}/stat", "r") as f:
+                fields = f.read().rsplit(")", 1)[1].split()
+            pid = int(name)
+            children.setdefault(int(fields[1]), []).append(pid)
+            rss[pid] = int(fields[21]) * page
+        except (OSError, IndexError, ValueError):
+            continue
+    total = 0
+    stack = [root_pid]
+    while stack:
+        pid = stack.pop()
+        total += rss.get(pid, 0)
+        stack.extend(children.get(pid, []))
+    return total
+
+
+class RssSampler:
+    """Samples the peak RSS of a process tree (this process by default) in the background."""
+
+    def __init__(self, pid=None, interval=0.2):
+        self.pid = pid or os.getpid()
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _sample(self):
+        try:
+            self.peak = max(self.peak, _process_tree_rss(self.pid))
+        except OSError:
+            # Not Linux: fall back to this process's own high-water mark
+            import resource
+            self.peak = max(self.peak, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._sample()
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+
+
+def _percentile(values, pct):
+    if not values:
+        return None
+    values = sorted(values)
+    k = min(len(values) - 1, max(0, round(pct / 100 * (len(values) - 1))))
+    return values[k]
+
+
+def _result(scale, stage, pages, seconds, latencies, peak_rss, **extra):
+    return {
+        "scale": scale,
+        "stage": stage,
+        "pages": pages,
+        "seconds": round(seconds, 3),
+        "pages_per_sec": round(pages / seconds, 2) if seconds else None,
+        "p50_ms": round(_percentile(latencies, 50) * 1000, 1) if latencies else None,
+        "p95_ms": round(_percentile(latencies, 95) * 1000, 1) if latencies else None,
+        "peak_rss_mb": round(peak_rss / 2**20, 1),
+        **extra,
+    }
+
+
+# --- stages --------------------------------------------------------------------
+
+def bench_directory(server, scale, args, stages):
+    """scroll and parse stages share one loaded listing page."""
+    import script
+
+    results = []
+    with RssSampler() as rss:
+        driver = script.get_driver(headless=True, profile=args.profile)
+        try:
+            driver.get(server.companies_url)
+            t0 = time.time()
+            rows = script.scroll_to_load_all(driver, timeout=args.timeout, pause=args.pause,
+                                             harvest=args.harvest)
+            scroll_s = time.time() - t0
+            if "scroll" in stages:
+                count = len(rows) if rows is not None else script._count_company_links(driver)
+                results.append(_result(scale, "scroll", count, scroll_s, [], rss.peak, companies=count))
+
+            if "parse" in stages:
+                for mode in ("js", "webdriver"):
+                    t0 = time.time()
+                    parsed = script.parse_company_cards(driver, mode=mode)
+                    results.append(_result(scale, f"parse-{mode}", len(parsed), time.time() - t0, [], rss.peak))
+        finally:
+            driver.quit()
+    return results
+
+
+def bench_jobs(server, scale, args, engine):
+    import script
+
+    n = min(scale, args.max_job_companies)
+    companies = [(f"{server.base_url}/companies/{_slug(i)}", f"Company {i}") for i in range(n)]
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    filters = script.JobFilters()
+    session = script.HttpSession()
+    fetcher = script.DetailFetcher(session, per_host=args.detail_concurrency)
+    pool = script.DriverPool(args.workers, headless=True, profile=args.profile)
+
+    def one(company):
+        url, name = company
+        t0 = time.time()
+        try:
+            if engine == "http":
+                jobs = script.scrape_jobs_for_company_http(session, url, name, fetcher, None, filters)
+            else:
+                jobs = script.scrape_jobs_for_company(pool.acquire(), url, name, fetcher, None, filters)
+        except script.TransientScrapeError:
+            # A failed page load shouldn't abort the whole stage; report it instead
+            with lock:
+                errors[0] += 1
+            return None
+        with lock:
+            latencies.append(time.time() - t0)
+        return jobs
+
+    from concurrent.futures import ThreadPoolExecutor
+    with RssSampler() as rss:
+        t0 = time.time()
+        try:
+            with ThreadPoolExecutor(max_workers=args.workers) as executor:
+                n_jobs = sum(len(j or []) for j in executor.map(one, companies))
+        finally:
+            pool.close()
+            fetcher.close()
+        elapsed = time.time() - t0
+    return [_result(scale, f"jobs-{engine}", n, elapsed, latencies, rss.peak, jobs=n_jobs, errors=errors[0])]
+
+
+def bench_pipeline(server, scale, args):
+    here = os.path.dirname(os.path.abspath(__file__))
+    with tempfile.TemporaryDirectory() as tmp:
+        cmd = [
+            sys.executable, os.path.join(here, "script.py"), "--headless", "--scrape-jobs",
+            "--companies-url", server.companies_url,
+            "--timeout", str(args.timeout), "--pause", str(args.pause),
+            "--workers", str(args.workers), "--engine", "http", "--no-detail-cache",
+            "--out-json", os.path.join(tmp, "companies.json"), "--out-csv", os.path.join(tmp, "companies.csv"),
+            "--jobs-json", os.path.join(tmp, "jobs.json"), "--jobs-csv", os.path.join(tmp, "jobs.csv"),
+            "--checkpoint", os.path.join(tmp, "jobs.checkpoint.jsonl"),
+        ]
+        t0 = time.time()
+        proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+        with RssSampler(pid=proc.pid) as rss:
+            _, err = proc.communicate()
+        elapsed = time.time() - t0
+        if proc.returncode != 0:
+            print(err, file=sys.stderr)
+            raise RuntimeError(f"pipeline exited with {proc.returncode}")
+        with open(os.path.join(tmp, "companies.json")) as f:
+            n_companies = len(json.load(f))
+        with open(os.path.join(tmp, "jobs.json")) as f:
+            n_jobs = len(json.load(f))
+    return [_result(scale, "pipeline", n_companies, elapsed, [], rss.peak, jobs=n_jobs)]
+
+
+# --- reporting -----------------------------------------------------------------
+
+def _git_commit():
+    try:
+        here = os.path.dirname(os.path.abspath(__file__))
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=here, text=True).strip()
+    except Exception:
+        return None
+
+
+def print_table(results):
+    cols = ["scale", "stage", "pages", "seconds", "pages_per_sec", "p50_ms", "p95_ms", "peak_rss_mb"]
+    print("  ".join(f"{c:>14}" for c in cols))
+    for r in results:
+        print("  ".join(f"{str(r.get(c)):>14}" for c in cols))
+
+
+def compare(old_path, new_path):
+    """Print the throughput/latency change per (scale, stage) between two result files."""
+    with open(old_path) as f:
+        old = {(r["scale"], r["stage"]): r for r in json.load(f)["results"]}
+    with open(new_path) as f:
+        new = json.load(f)["results"]
+    for r in new:
+        prev = old.get((r["scale"], r["stage"]))
+        if not prev:
+            continue
+        parts = [f"{r['stage']}@{r['scale']}:"]
+        for key in ("seconds", "pages_per_sec", "p95_ms", "peak_rss_mb"):
+            a, b = prev.get(key), r.get(key)
+            if a and b is not None:
+                parts.append(f"{key} {a} -> {b} ({(b - a) / a * 100:+.1f}%)")
+        print("  ".join(parts))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the scraper against a local replay server.")
+    parser.add_argument("--scales", default="100,1000,5000", help="Comma-separated company counts")
+    parser.add_argument("--stages", default=",".join(STAGES), help=f"Comma-separated subset of {STAGES}")
+    parser.add_argument("--fixtures", help="Serve recorded pages from this directory instead of synthetic ones")
+    parser.add_argument("--jobs-per-company", type=int, default=4)
+    parser.add_argument("--latency-ms", type=float, default=0, help="Artificial server latency per request")
+    parser.add_argument("--max-job-companies", type=int, default=500, help="Cap on companies for the jobs stages")
+    parser.add_argument("--workers", type=int, default=5)
+    parser.add_argument("--detail-concurrency", type=int, default=8)
+    parser.add_argument("--profile", choices=["full", "lean"], default="lean")
+    parser.add_argument("--harvest", action="store_true", help="Use incremental card harvesting in the scroll stage")
+    parser.add_argument("--timeout", type=int, default=600)
+    parser.add_argument("--pause", type=float, default=2.0)
+    parser.add_argument("--out-dir", default="bench_results")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="Compare two saved result files and exit")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    stages = [s.strip() for s in args.stages.split(",") if s.strip()]
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        parser.error(f"unknown stages: {', '.join(sorted(unknown))}")
+
+    results = []
+    for scale in [int(s) for s in args.scales.split(",")]:
+        with ReplayServer(scale, args.jobs_per_company, args.latency_ms, args.fixtures) as server:
+            print(f"\n== {scale} companies ({server.base_url}) ==")
+            if "scroll" in stages or "parse" in stages:
+                results.extend(bench_directory(server, scale, args, stages))
+            if "jobs-selenium" in stages:
+                results.extend(bench_jobs(server, scale, args, "selenium"))
+            if "jobs-http" in stages:
+                results.extend(bench_jobs(server, scale, args, "http"))
+            if "pipeline" in stages:
+                results.extend(bench_pipeline(server, scale, args))
+
+    print()
+    print_table(results)
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    out_path = os.path.join(args.out_dir, f"bench-{stamp}.json")
+    with open(out_path, "w") as f:
+        json.dump({
+            "meta": {
+                "timestamp": stamp,
+                "commit": _git_commit(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "argv": sys.argv[1:],
+            },
+            "results": results,
+        }, f, indent=2)
+    print(f"\nSaved results to {out_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Text parsers shared by the scraper and the query CLI.
+
+Kept free of Selenium (and anything else slow to import) so query.py can
+use them without paying for the browser stack.
+"""
+import re
+from datetime import datetime, timezone
+
+
+def _parse_location_text(ltxt):
+    # location currently formatted like this "locations": "San Francisco, CA, USA"
+    # goal: "locations": {"city": "San Francisco", "state": "CA", "country": "USA"}
+    # Anything without all three parts is kept as the split list.
+    parts = ltxt.split(", ")
+    if len(parts) < 3:
+        return parts
+    return {
+        "city": parts[0],
+        "state": parts[1],
+        "country": parts[2],
+    }
+
+
+_MONEY_RE = re.compile(r"([$€£])?\s?(\d[\d,]*(?:\.\d+)?)\s?([KkMm])?(?!\s*%)")
+_CURRENCIES = {"$": "USD", "€": "EUR", "£": "GBP"}
+
+
+def _parse_salary(text):
+    """Parse a salary chip like "$120K – $180K" into (min, max, currency); Nones if unparseable."""
+    if not text:
+        return None, None, None
+    amounts = []
+    currency = None
+    for symbol, number, suffix in _MONEY_RE.findall(text):
+        # Bare numbers without a currency symbol or K/M suffix are equity, years, etc.
+        if not symbol and not suffix:
+            continue
+        value = float(number.replace(",", ""))
+        if suffix in ("K", "k"):
+            value *= 1_000
+        elif suffix in ("M", "m"):
+            value *= 1_000_000
+        amounts.append(value)
+        if symbol and currency is None:
+            currency = _CURRENCIES[symbol]
+    if not amounts:
+        return None, None, None
+    return min(amounts), max(amounts), currency
+
+
+def _parse_experience_years(text):
+    """Minimum years of experience from chips like "3+ years" or "Any (new grads ok)"."""
+    if not text:
+        return None
+    m = re.search(r"\d+", text)
+    if m:
+        return int(m.group())
+    lowered = text.lower()
+    if "new grad" in lowered or lowered.startswith("any"):
+        return 0
+    return None
+
+
+def _parse_iso_guess_to_utc(dt_str: str) -> datetime | None:
+    if not dt_str:
+        return None
+    s = dt_str.strip()
+    try:
+        # Handle trailing Z
+        if s.endswith("Z"):
+            s = s[:-1] + "+00:00"
+        dt = datetime.fromisoformat(s)
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        else:
+            dt = dt.astimezone(timezone.utc)
+        return dt
+    except Exception:
+        # Fallback common formats
+        for fmt in ("%Y-%m-%dT%H:%M:%S%z", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d"):
+            try:
+                dt = datetime.strptime(dt_str, fmt)
+                if dt.tzinfo is None:
+                    dt = dt.replace(tzinfo=timezone.utc)
+                else:
+                    dt = dt.astimezone(timezone.utc)
+                return dt
+            except Exception:
+                pass
+    return None
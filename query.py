@@ -0,0 +1,248 @@
+"""Search scraped jobs from the command line.
+
+    python script.py query senior backend --location nyc --min-salary 150000 --since 7d
+
+The first query builds a SQLite index next to jobs.json (rebuilt whenever
+jobs.json or companies.json changes): an inverted index of title, location
+and company blurb terms, plus sorted indexes on date_posted and salary.
+Queries then only touch the postings and rows they need.
+
+Only the standard library and parsing.py are imported, so this starts fast;
+don't import script.py (and with it Selenium) from here.
+"""
+import argparse
+import json
+import os
+import re
+import sqlite3
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+from parsing import _parse_iso_guess_to_utc, _parse_salary
+
+
+INDEX_VERSION = 1
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*")
+# Common shorthands, expanded to the words that appear in location strings
+LOCATION_ALIASES = {
+    "nyc": "new york",
+    "sf": "san francisco",
+    "la": "los angeles",
+}
+
+
+def _tokens(text):
+    return _TOKEN_RE.findall(text.lower()) if text else []
+
+
+def _source_stamp(jobs_json, companies_json):
+    """Size and mtime of the inputs; the index is rebuilt when this changes."""
+    stamp = []
+    for path in (jobs_json, companies_json):
+        st = os.stat(path) if path and os.path.exists(path) else None
+        stamp.append([path, st.st_size, st.st_mtime_ns] if st else [path, None, None])
+    return json.dumps([INDEX_VERSION, stamp])
+
+
+def build_index(index_path, jobs_json, companies_json=None):
+    """(Re)build the index at index_path from the scraper's JSON outputs. Returns the job count."""
+    with open(jobs_json, "r") as f:
+        jobs = json.load(f)
+    blurbs = {}
+    if companies_json and os.path.exists(companies_json):
+        with open(companies_json, "r") as f:
+            blurbs = {c.get("company_url"): c.get("blurb") for c in json.load(f)}
+
+    tmp_path = index_path + ".tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    conn = sqlite3.connect(tmp_path)
+    conn.execute("PRAGMA journal_mode=OFF")
+    conn.execute("PRAGMA synchronous=OFF")
+    conn.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)")
+    conn.execute(
+        "CREATE TABLE jobs ("
+        " id INTEGER PRIMARY KEY,"
+        " posted REAL,"
+        " salary_min REAL,"
+        " salary_max REAL,"
+        " record TEXT NOT NULL)"
+    )
+    # One row per (field, term, job): the inverted index, stored sorted by its key
+    conn.execute(
+        "CREATE TABLE postings (field TEXT NOT NULL, term TEXT NOT NULL, job_id INTEGER NOT NULL,"
+        " PRIMARY KEY (field, term, job_id)) WITHOUT ROWID"
+    )
+
+    job_rows = []
+    postings = {}
+    # Salary and date strings repeat a lot; parse each distinct one once
+    salaries = {}
+    dates = {}
+    for job_id, job in enumerate(jobs):
+        salary, date_posted = job.get("salary"), job.get("date_posted")
+        if salary not in salaries:
+            salaries[salary] = _parse_salary(salary)
+        if date_posted not in dates:
+            posted = _parse_iso_guess_to_utc(date_posted)
+            dates[date_posted] = posted.timestamp() if posted else None
+        low, high, _ = salaries[salary]
+        job_rows.append((job_id, dates[date_posted], low, high, json.dumps(job)))
+        texts = {
+            "title": job.get("job_title"),
+            "location": job.get("location"),
+            "blurb": blurbs.get(job.get("company_url")),
+        }
+        for field, text in texts.items():
+            for term in set(_tokens(text)):
+                # job ids arrive in order, so each posting list is already sorted
+                postings.setdefault((field, term), []).append(job_id)
+
+    conn.executemany("INSERT INTO jobs VALUES (?, ?, ?, ?, ?)", job_rows)
+    conn.executemany("INSERT INTO postings VALUES (?, ?, ?)",
+                     ((field, term, job_id) for (field, term) in sorted(postings) for job_id in postings[field, term]))
+    # Sorted indexes for the range filters and ORDER BY
+    conn.execute("CREATE INDEX jobs_posted ON jobs (posted)")
+    conn.execute("CREATE INDEX jobs_salary ON jobs (salary_max)")
+    conn.execute("INSERT INTO meta VALUES ('source', ?)", (_source_stamp(jobs_json, companies_json),))
+    conn.commit()
+    conn.execute("ANALYZE")
+    conn.close()
+    os.replace(tmp_path, index_path)
+    return len(job_rows)
+
+
+def open_index(index_path, jobs_json, companies_json=None, rebuild=False):
+    """Open the index, building it first if it is missing or its inputs changed."""
+    stale = rebuild or not os.path.exists(index_path)
+    if not stale:
+        conn = sqlite3.connect(index_path)
+        try:
+            row = conn.execute("SELECT value FROM meta WHERE key = 'source'").fetchone()
+        except sqlite3.DatabaseError:
+            row = None
+        if row and row[0] == _source_stamp(jobs_json, companies_json):
+            return conn
+        conn.close()
+    t0 = time.time()
+    n = build_index(index_path, jobs_json, companies_json)
+    print(f"Indexed {n} jobs into {index_path} in {time.time() - t0:.2f}s", file=sys.stderr)
+    return sqlite3.connect(index_path)
+
+
+def _term_clause(field, term, params):
+    """SELECT of job ids matching term in field (or in any field when field is None).
+    A trailing * matches as a prefix."""
+    where = []
+    if field:
+        where.append("field = ?")
+        params.append(field)
+    if term.endswith("*") and len(term) > 1:
+        prefix = term[:-1]
+        where.append("term >= ? AND term < ?")
+        params.extend([prefix, prefix + "\uffff"])
+    else:
+        where.append("term = ?")
+        params.append(term)
+    return f"SELECT job_id FROM postings WHERE {' AND '.join(where)}"
+
+
+def _parse_since(text, now=None):
+    """"7d", "24h" or an ISO date -> UTC datetime."""
+    now = now or datetime.now(timezone.utc)
+    m = re.fullmatch(r"(\d+)\s*([dhw])", text.strip().lower())
+    if m:
+        n, unit = int(m.group(1)), m.group(2)
+        return now - {"h": timedelta(hours=n), "d": timedelta(days=n), "w": timedelta(weeks=n)}[unit]
+    dt = _parse_iso_guess_to_utc(text)
+    if dt is None:
+        raise ValueError(f"Unrecognized --since value: {text!r}")
+    return dt
+
+
+def search(conn, text=None, title=None, location=None, blurb=None, min_salary=None,
+           since=None, sort="date", limit=20):
+    """Jobs matching every term, newest (or best paid) first.
+
+    Terms in text may match any field; title, location and blurb terms only
+    match their own field. min_salary compares with the top of the posted
+    range, like the scraper's --min-salary filter, but jobs without a salary
+    are excluded here.
+    """
+    params = []
+    term_queries = []
+    for field, value in ((None, text), ("title", title), ("location", location), ("blurb", blurb)):
+        if not value:
+            continue
+        if field == "location":
+            value = " ".join(LOCATION_ALIASES.get(t, t) for t in value.lower().split())
+        for term in re.findall(r"[a-z0-9][a-z0-9+#]*\*?", value.lower()):
+            term_queries.append(_term_clause(field, term, params))
+
+    where = []
+    if term_queries:
+        where.append(f"id IN ({' INTERSECT '.join(term_queries)})")
+    if min_salary is not None:
+        where.append("salary_max >= ?")
+        params.append(min_salary)
+    if since is not None:
+        where.append("posted >= ?")
+        params.append(since.timestamp())
+
+    order = "salary_max DESC, posted DESC" if sort == "salary" else "posted DESC, salary_max DESC"
+    sql = "SELECT record FROM jobs"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += f" ORDER BY {order} LIMIT ?"
+    params.append(limit)
+    return [json.loads(record) for (record,) in conn.execute(sql, params)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="script.py query", description="Search scraped jobs through a persisted index.")
+    parser.add_argument("text", nargs="*", help="Terms matched against title, location and company blurb (all must match; term* for a prefix)")
+    parser.add_argument("--title", help="Terms that must appear in the job title")
+    parser.add_argument("--location", help="Terms that must appear in the location (nyc, sf, la are expanded)")
+    parser.add_argument("--blurb", help="Terms that must appear in the company blurb")
+    parser.add_argument("--min-salary", type=float, help="Top of the salary range at least this much")
+    parser.add_argument("--since", help="Posted within this window (7d, 24h, 2w) or since an ISO date")
+    parser.add_argument("--sort", choices=["date", "salary"], default="date")
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--json", action="store_true", help="Print matching jobs as JSON")
+    parser.add_argument("--jobs-json", default="jobs.json")
+    parser.add_argument("--companies-json", default="companies.json", help="Source of company blurbs")
+    parser.add_argument("--index", help="Index file (default: <jobs-json>.idx)")
+    parser.add_argument("--rebuild", action="store_true", help="Rebuild the index even if it looks current")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.jobs_json):
+        parser.error(f"{args.jobs_json} not found; run the scraper with --scrape-jobs first")
+    try:
+        since = _parse_since(args.since) if args.since else None
+    except ValueError as e:
+        parser.error(str(e))
+
+    conn = open_index(args.index or args.jobs_json + ".idx", args.jobs_json, args.companies_json, args.rebuild)
+    try:
+        t0 = time.time()
+        jobs = search(conn, " ".join(args.text), args.title, args.location, args.blurb,
+                      args.min_salary, since, args.sort, args.limit)
+        elapsed = time.time() - t0
+    finally:
+        conn.close()
+
+    if args.json:
+        print(json.dumps(jobs, indent=2))
+    else:
+        for job in jobs:
+            posted = (job.get("date_posted") or "")[:10] or "?"
+            print(f"{posted}  {job.get('salary') or '-':<18} {job.get('job_title')} @ {job.get('company_name')}"
+                  f" ({job.get('location') or '-'})  {job.get('job_url')}")
+    print(f"{len(jobs)} jobs in {elapsed * 1000:.1f} ms", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
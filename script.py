@@ -1,12 +1,35 @@
 import os
+import random
 import time
 import csv
 import json
 import argparse
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from threading import Lock
+import atexit
+import gzip
+import hashlib
+import http.client
+import re
+import socket
+import sqlite3
+import subprocess
+import sys
+import zlib
+from collections import deque, namedtuple
+from html.parser import HTMLParser
+from urllib.parse import urlencode, urljoin, urlsplit
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import BoundedSemaphore, Event, Lock, Thread, current_thread, get_ident, local
 from datetime import datetime, timezone
 
+if __name__ == "__main__" and sys.argv[1:2] == ["query"]:
+    # The query CLI only reads saved outputs; dispatch before the Selenium imports so it starts fast
+    import query
+    sys.exit(query.main(sys.argv[2:]))
+
+from parsing import _parse_experience_years, _parse_iso_guess_to_utc, _parse_location_text, _parse_salary
 
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -14,12 +37,218 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+try:
+    # Optional: only needed for the columnar --jobs-parquet / --companies-parquet exports
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
 
 
 YC_COMPANIES_URL = "https://www.ycombinator.com/companies"
+FOUNDERS_URL = "https://www.ycombinator.com/companies/founders"
+USER_AGENT = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36"
+)
+
+
+# "lean" profile: we only read DOM text and JSON-LD, so skip everything else
+LEAN_CHROME_ARGS = [
+    "--blink-settings=imagesEnabled=false",
+    "--mute-audio",
+    "--no-first-run",
+    "--disable-extensions",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-features=Translate,MediaRouter,OptimizationHints",
+    "--renderer-process-limit=2",
+    "--js-flags=--max-old-space-size=512",
+]
+LEAN_BLOCKED_URLS = [
+    # images and media
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico",
+    "*.mp4", "*.webm", "*.mp3", "*.m4a",
+    # fonts
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    # analytics and trackers
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*segment.com*", "*segment.io*", "*hotjar.com*", "*facebook.net*",
+    "*intercom.io*", "*sentry.io*", "*posthog.com*",
+]
+DRIVER_PROFILES = ["full", "lean"]
+
+
+class Metrics:
+    """Thread-safe counters and latency histograms with Prometheus text export and
+    an optional Chrome trace-event log (chrome://tracing / Perfetto)."""
+
+    BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+    HELP = {
+        "scraper_stage_seconds": ("histogram", "Wall time spent in each instrumented stage"),
+        "scraper_stage_errors_total": ("counter", "Exceptions raised out of each stage"),
+        "scraper_errors_total": ("counter", "Errors swallowed inside a stage"),
+        "scraper_webdriver_commands_total": ("counter", "WebDriver commands sent to chromedriver"),
+        "scraper_http_requests_total": ("counter", "HTTP requests by host and status"),
+        "scraper_http_response_bytes_total": ("counter", "HTTP response bytes received (as sent on the wire)"),
+        "scraper_retries_total": ("counter", "Retried operations"),
+        "scraper_driver_recycles_total": ("counter", "Pooled drivers replaced, by reason"),
+        "scraper_wait_seconds": ("histogram", "Time spent in condition-based waits"),
+        "scraper_scheduler_adjustments_total": ("counter", "Adaptive concurrency limit changes"),
+    }
+
+    def __init__(self):
+        self._lock = Lock()
+        self._counters = {}
+        self._histograms = {}
+        self._trace = None
+        self._t0 = time.time()
+
+    @staticmethod
+    def _key(name, labels):
+        return name, tuple(sorted(labels.items()))
+
+    def inc(self, name, value=1, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, seconds, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            h = self._histograms.get(key)
+            if h is None:
+                h = self._histograms[key] = [[0] * len(self.BUCKETS), 0, 0.0]
+            for i, bound in enumerate(self.BUCKETS):
+                if seconds <= bound:
+                    h[0][i] += 1
+            h[1] += 1
+            h[2] += seconds
+
+    def enable_trace(self):
+        self._trace = []
+
+    @contextmanager
+    def stage(self, name, **labels):
+        """Time a block as `name`; exceptions are counted and re-raised."""
+        start = time.time()
+        try:
+            yield
+        except Exception:
+            self.inc("scraper_stage_errors_total", stage=name)
+            raise
+        finally:
+            elapsed = time.time() - start
+            self.observe("scraper_stage_seconds", elapsed, stage=name)
+            if self._trace is not None:
+                with self._lock:
+                    self._trace.append({
+                        "name": name, "ph": "X", "pid": os.getpid(), "tid": get_ident(),
+                        "ts": int((start - self._t0) * 1e6), "dur": int(elapsed * 1e6),
+                        "args": {k: str(v) for k, v in labels.items()},
+                    })
+
+    def to_prometheus(self):
+        def fmt(labels):
+            if not labels:
+                return ""
+            escaped = (
+                (k, str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+                for k, v in labels
+            )
+            return "{" + ",".join(f'{k}="{v}"' for k, v in escaped) + "}"
+
+        lines = []
+        with self._lock:
+            names = sorted({k[0] for k in self._counters} | {k[0] for k in self._histograms})
+            for name in names:
+                kind, help_text = self.HELP.get(name, ("untyped", name))
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                for (n, labels), value in sorted(self._counters.items()):
+                    if n == name:
+                        lines.append(f"{name}{fmt(labels)} {value}")
+                for (n, labels), (buckets, count, total) in sorted(self._histograms.items()):
+                    if n != name:
+                        continue
+                    for bound, c in zip(self.BUCKETS, buckets):
+                        lines.append(f"{name}_bucket{fmt(labels + (('le', bound),))} {c}")
+                    lines.append(f"{name}_bucket{fmt(labels + (('le', '+Inf'),))} {count}")
+                    lines.append(f"{name}_sum{fmt(labels)} {total:.6f}")
+                    lines.append(f"{name}_count{fmt(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path):
+        # Write then rename so a scraper (e.g. node_exporter textfile collector) never sees half a file
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp, path)
+
+    def write_trace(self, path):
+        with self._lock:
+            events = list(self._trace or [])
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+    def serve(self, port):
+        """Expose /metrics on a background HTTP server."""
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = metrics.to_prometheus().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(("0.0.0.0", port), Handler)
+        Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+
+METRICS = Metrics()
+
+
+def instrumented(stage_name):
+    """Decorator recording a function's calls as an instrumented stage."""
+    def decorate(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with METRICS.stage(stage_name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def _count_webdriver_commands(driver):
+    # Every WebDriver call goes through execute(); count them per command name
+    execute = driver.execute
+
+    def counted(driver_command, params=None):
+        METRICS.inc("scraper_webdriver_commands_total", command=driver_command)
+        return execute(driver_command, params)
 
+    driver.execute = counted
 
-def get_driver(headless=True, extra_args=None):
+
+@instrumented("get_driver")
+def get_driver(headless=True, extra_args=None, profile="full"):
+    """Launch Chrome.
+
+    profile="full" loads pages exactly like a normal browser. profile="lean"
+    returns from get() at DOMContentLoaded, blocks images, media, fonts and
+    analytics through DevTools, and trims Chrome's memory use.
+    """
     opts = Options()
     if headless:
         opts.add_argument("--headless=new")
@@ -27,71 +256,311 @@ def get_driver(headless=True, extra_args=None):
     opts.add_argument("--no-sandbox")
     opts.add_argument("--window-size=1280,2000")
     opts.add_argument("--disable-dev-shm-usage")
-    opts.add_argument(
-        "--user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-        "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36"
-    )
+    opts.add_argument(f"--user-agent={USER_AGENT}")
+    if profile == "lean":
+        opts.page_load_strategy = "eager"
+        opts.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+        for a in LEAN_CHROME_ARGS:
+            opts.add_argument(a)
     if extra_args:
         for a in extra_args:
             opts.add_argument(a)
-    return webdriver.Chrome(options=opts)
+    driver = webdriver.Chrome(options=opts)
+    _count_webdriver_commands(driver)
+
+    if profile == "lean":
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": LEAN_BLOCKED_URLS})
+        except Exception as e:
+            print(f"Could not enable request blocking for lean profile: {e}")
+    return driver
+
+
+class DriverPool:
+    """Bounded pool of long-lived Chrome drivers, one per worker thread.
+
+    Drivers are created lazily the first time a thread asks for one and are
+    recycled after `max_pages` page loads or when a health check fails.
+    Drivers whose owning thread has exited (e.g. a finished executor) are
+    quit before new ones are started, so the pool can outlive its threads.
+    """
+
+    def __init__(self, size, headless=True, max_pages=50, extra_args=None, profile="full"):
+        self.size = size
+        self.headless = headless
+        self.max_pages = max_pages
+        self.extra_args = extra_args
+        self.profile = profile
+        self._local = local()
+        self._lock = Lock()
+        self._drivers = {}  # driver -> owning thread
+        self._closed = False
+
+    def acquire(self):
+        """Return the calling thread's driver, (re)creating it if needed."""
+        driver = getattr(self._local, "driver", None)
+        if driver is not None:
+            if self._local.pages >= self.max_pages:
+                METRICS.inc("scraper_driver_recycles_total", reason="max_pages")
+                self.discard()
+                driver = None
+            elif not self._is_healthy(driver):
+                METRICS.inc("scraper_driver_recycles_total", reason="unhealthy")
+                self.discard()
+                driver = None
+
+        if driver is None:
+            self._reap()
+            with self._lock:
+                if self._closed:
+                    raise RuntimeError("DriverPool is closed")
+                if len(self._drivers) >= self.size:
+                    raise RuntimeError(f"DriverPool exhausted ({self.size} drivers in use)")
+            driver = get_driver(headless=self.headless, extra_args=self.extra_args, profile=self.profile)
+            with self._lock:
+                self._drivers[driver] = current_thread()
+            self._local.driver = driver
+            self._local.pages = 0
+
+        self._local.pages += 1
+        return driver
+
+    def discard(self):
+        """Quit the calling thread's driver, e.g. after it crashed."""
+        driver = getattr(self._local, "driver", None)
+        if driver is None:
+            return
+        self._local.driver = None
+        with self._lock:
+            self._drivers.pop(driver, None)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def _reap(self):
+        """Quit drivers left behind by threads that no longer exist."""
+        with self._lock:
+            orphans = [d for d, owner in self._drivers.items() if not owner.is_alive()]
+            for driver in orphans:
+                del self._drivers[driver]
+        for driver in orphans:
+            METRICS.inc("scraper_driver_recycles_total", reason="orphaned")
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+    def close(self):
+        """Quit every driver in the pool. Call once all workers are done."""
+        with self._lock:
+            self._closed = True
+            drivers = list(self._drivers)
+            self._drivers.clear()
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+    @staticmethod
+    def _is_healthy(driver):
+        # A dead chromedriver/Chrome raises here; stray tabs left behind by a
+        # failed detail fetch are closed so the next page starts clean.
+        try:
+            handles = driver.window_handles
+            if len(handles) > 1:
+                for h in handles[1:]:
+                    driver.switch_to.window(h)
+                    driver.close()
+                driver.switch_to.window(handles[0])
+            return True
+        except Exception:
+            return False
+
+
+class WaitStats:
+    """Thread-safe record of how long each labelled wait actually took."""
+
+    def __init__(self):
+        self._lock = Lock()
+        self._durations = {}
+        self._timeouts = {}
+
+    def record(self, label, seconds, ok):
+        METRICS.observe("scraper_wait_seconds", seconds, label=label)
+        with self._lock:
+            self._durations.setdefault(label, []).append(seconds)
+            if not ok:
+                self._timeouts[label] = self._timeouts.get(label, 0) + 1
 
+    def summary(self):
+        lines = []
+        with self._lock:
+            for label, ds in sorted(self._durations.items()):
+                ds = sorted(ds)
+                lines.append(
+                    f"  {label}: n={len(ds)} total={sum(ds):.1f}s "
+                    f"p50={ds[len(ds) // 2]:.2f}s max={ds[-1]:.2f}s timeouts={self._timeouts.get(label, 0)}"
+                )
+        return "Waits:\n" + "\n".join(lines) if lines else "Waits: none"
 
+
+class WaitConfig:
+    """Tunables for the condition-based waits; set from the CLI in main()."""
+
+    def __init__(self, poll=0.1, quiet=0.5, timeout=10.0):
+        self.poll = poll          # seconds between condition checks
+        self.quiet = quiet        # how long the network/card count must stay unchanged
+        self.timeout = timeout    # default upper bound for a single wait
+        self.stats = WaitStats()
+
+
+WAITS = WaitConfig()
+
+
+def wait_until(condition, timeout=None, label="wait"):
+    """Poll condition() until it returns something truthy; returns it, or False on timeout.
+
+    Exceptions from condition() count as "not yet". The elapsed time is recorded
+    under label in WAITS.stats.
+    """
+    timeout = WAITS.timeout if timeout is None else timeout
+    start = time.time()
+    result = False
+    while True:
+        try:
+            result = condition()
+        except Exception:
+            result = False
+        if result or time.time() - start >= timeout:
+            break
+        time.sleep(WAITS.poll)
+    WAITS.stats.record(label, time.time() - start, bool(result))
+    return result
+
+
+# Counts in-flight fetch/XHR requests (hooked on first call after each navigation)
+# alongside the resource-timing entry count and readyState.
+_NETWORK_PROBE_JS = """
+if (!window.__ycNet) {
+    const n = window.__ycNet = {inflight: 0};
+    try { performance.setResourceTimingBufferSize(100000); } catch (e) {}
+    const origFetch = window.fetch;
+    if (origFetch) {
+        window.fetch = function () {
+            n.inflight++;
+            return origFetch.apply(this, arguments).finally(() => { n.inflight--; });
+        };
+    }
+    const origSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        n.inflight++;
+        this.addEventListener("loadend", () => { n.inflight--; }, {once: true});
+        return origSend.apply(this, arguments);
+    };
+}
+return [window.__ycNet.inflight, performance.getEntriesByType("resource").length, document.readyState];
+"""
+
+
+def _network_idle_check(driver, quiet=None):
+    """Return a condition that holds once the page has loaded and no request started
+    or finished for `quiet` seconds."""
+    quiet = WAITS.quiet if quiet is None else quiet
+    state = {"last": None, "since": time.time()}
+
+    def idle():
+        inflight, resources, ready = driver.execute_script(_NETWORK_PROBE_JS)
+        snapshot = (inflight, resources, ready)
+        now = time.time()
+        if snapshot != state["last"]:
+            state["last"] = snapshot
+            state["since"] = now
+            return False
+        return inflight == 0 and ready == "complete" and now - state["since"] >= quiet
+
+    return idle
+
+
+def wait_for_network_idle(driver, timeout=None, quiet=None, label="network_idle"):
+    return wait_until(_network_idle_check(driver, quiet), timeout, label)
+
+
+def wait_for_element(driver, by, selector, timeout=None, label="element"):
+    """Wait until at least one element matches; returns the matches or False."""
+    return wait_until(lambda: driver.find_elements(by, selector), timeout, label)
+
+
+def wait_for_count_change(count_fn, previous, timeout=None, label="count_change"):
+    """Wait until count_fn() differs from previous; returns the new count or False."""
+    def changed():
+        now = count_fn()
+        return now if now != previous else False
+    return wait_until(changed, timeout, label)
+
+
+# Number of distinct company links currently on the page, in one roundtrip
+_COUNT_CARDS_JS = """
+const hrefs = new Set();
+for (const a of document.querySelectorAll("a[href^='/companies/']")) {
+    if (a.href && a.href !== arguments[0]) hrefs.add(a.href);
+}
+return hrefs.size;
+"""
+
+
+def _count_company_links(driver):
+    return driver.execute_script(_COUNT_CARDS_JS, FOUNDERS_URL)
+
+
+@instrumented("apply_filters")
 def apply_filters(driver):
     wait = WebDriverWait(driver, 30)
     wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-    time.sleep(1)
+    wait_for_network_idle(driver, label="apply_filters.page_idle")
+
+    hiring_xpath = "//label[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'is hiring')]/input | //input[@type='checkbox' and @name='isHiring'] | //button[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'is hiring')]"
 
     # Open Filters panel if collapsed
     try:
         filter_button = driver.find_element(By.XPATH, "//button[contains(., 'Filters')] | //button[contains(., 'Filter')] | //button[contains(., 'filters')]")
         if filter_button.is_displayed():
             filter_button.click()
-            time.sleep(0.5)
+            wait_for_element(driver, By.XPATH, hiring_xpath, timeout=5, label="apply_filters.panel_open")
     except Exception:
         pass
 
-    # Helper to count current visible company cards
-    def _count_cards():
-        links = driver.find_elements(By.CSS_SELECTOR, "a[href^='/companies/']")
-        return len({a.get_attribute("href") for a in links if a.get_attribute("href")})
-
     # Helper to wait for result count change or URL chip update
     def _wait_results_change(prev_count, timeout=15):
-        end = time.time() + timeout
-        while time.time() < end:
-            try:
-                now = _count_cards()
-                if now != prev_count:
-                    return True
-                url = driver.current_url.lower()
-                if "United States of America" in url:
-                    return True
-            except Exception:
-                pass
-            time.sleep(0.5)
-        return False
+        def changed():
+            if _count_company_links(driver) != prev_count:
+                return True
+            url = driver.current_url.lower()
+            return "United States of America" in url
+        return wait_until(changed, timeout, "apply_filters.results_change")
 
     # Toggle "Is Hiring"
     try:
-        hiring = driver.find_element(By.XPATH, "//label[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'is hiring')]/input | //input[@type='checkbox' and @name='isHiring'] | //button[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'is hiring')]")
+        hiring = driver.find_element(By.XPATH, hiring_xpath)
         if hiring.tag_name.lower() == "input":
             if not hiring.is_selected():
                 driver.execute_script("arguments[0].click();", hiring)
         else:
             hiring.click()
-        time.sleep(0.5)
+        wait_for_network_idle(driver, timeout=5, label="apply_filters.hiring")
     except Exception:
         # Fallback: search any element with text 'Is Hiring'
         try:
             el = driver.find_element(By.XPATH, "//*[contains(translate(normalize-space(.), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'is hiring')]")
             driver.execute_script("arguments[0].click();", el)
-            time.sleep(0.5)
+            wait_for_network_idle(driver, timeout=5, label="apply_filters.hiring")
         except Exception:
             pass
 
     # Track count to detect changes
-    before = _count_cards()
+    before = _count_company_links(driver)
 
     try:
         # ensure 'America / Canada' region filter is checked via its label
@@ -99,7 +568,8 @@ def apply_filters(driver):
         if not ac_input.is_selected():
             ac_label = driver.find_element(By.XPATH, "//label[.//span[normalize-space()='America / Canada']]")
             driver.execute_script("arguments[0].click();", ac_label)
-        time.sleep(0.5)
+        # Checking the region reveals its countries
+        wait_for_element(driver, By.XPATH, "//span[normalize-space()='United States of America']", timeout=5, label="apply_filters.region")
     except Exception:
         print("America / Canada checkbox not found")
         pass
@@ -113,427 +583,2648 @@ def apply_filters(driver):
             # input may be visually hidden; toggle via its label to ensure click works
             label = driver.find_element(By.XPATH, "//label[.//span[normalize-space()='United States of America']]")
             driver.execute_script("arguments[0].click();", label)
-        time.sleep(0.5)
     except Exception:
         # Fallback: click any visible element containing 'USA'
         try:
             print("USA option not found")
             el = driver.find_element(By.XPATH, "//*[contains(normalize-space(.), 'United States of America')]")
             driver.execute_script("arguments[0].click();", el)
-            time.sleep(0.5)
         except Exception:
             pass
 
     # Give results time to refresh
     if not _wait_results_change(before, timeout=20):
-        time.sleep(2)
+        wait_for_network_idle(driver, timeout=5, label="apply_filters.results_idle")
+
 
+def _wait_for_more_cards(driver, previous, timeout, label):
+    """Return as soon as more company links appear, or the network has gone quiet with none."""
+    idle = _network_idle_check(driver)
+    return wait_until(lambda: _count_company_links(driver) > previous or idle(), timeout, label)
 
-def scroll_to_load_all(driver, timeout=120, pause=1.5, max_idle=8):
+
+@instrumented("scroll_to_load_all")
+def scroll_to_load_all(driver, timeout=120, pause=1.5, max_idle=8, harvest=False):
+    """Scroll the directory until no new companies load.
+
+    It stops after max_idle checks without new cards that together span at
+    least max_idle * 2 * pause seconds (the two waits per check, at their
+    cap), since the waits return early once the network goes quiet.
+
+    With harvest=True an in-page MutationObserver queues cards as they are
+    added, each iteration only pulls the new ones, and the accumulated company
+    rows are returned so no final parse_company_cards pass is needed.
+    """
     start = time.time()
     last_seen = 0
     idle = 0
+    last_growth = start
+    idle_window = max_idle * 2 * pause
+    harvested = {}
+    if harvest:
+        _install_card_observer(driver)
 
     while True:
-        # do not count href https://www.ycombinator.com/companies/founders
-        cards = driver.find_elements(By.CSS_SELECTOR, "a[href^='/companies/']")
-        unique = {c.get_attribute("href") for c in cards if c.get_attribute("href") and c.get_attribute("href") != "https://www.ycombinator.com/companies/founders"}
-        count = len(unique)
+        if harvest:
+            _harvest_new_cards(driver, harvested)
+            count = len(harvested)
+            links_before = _count_company_links(driver)
+        else:
+            # Unique company hrefs (minus the founders page) in one script call
+            count = links_before = _count_company_links(driver)
         print(f"Currently scraped: {count} companies")
 
-        # Scroll to bottom
+        # Scroll to bottom; `pause` caps the wait for new cards or the network to go quiet
         driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        time.sleep(pause)
+        _wait_for_more_cards(driver, links_before, pause, "scroll.after_scroll")
         
         # Additional scroll to ensure lazy loading triggers
+        links_before = _count_company_links(driver)
         driver.find_element(By.TAG_NAME, "body").send_keys(Keys.END)
-        time.sleep(pause)
+        _wait_for_more_cards(driver, links_before, pause, "scroll.after_end_key")
 
         if count <= last_seen:
             idle += 1
         else:
             idle = 0
             last_seen = count
+            last_growth = time.time()
 
         # Try clicking a 'Load more' button if present (check multiple variants)
         try:
             more = driver.find_element(By.XPATH, "//button[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'load') and contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'more')]")
             if more.is_displayed() and more.is_enabled():
                 driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", more)
-                time.sleep(0.5)
+                links_before = _count_company_links(driver)
                 more.click()
-                time.sleep(pause * 2)
+                _wait_for_more_cards(driver, links_before, pause * 2, "scroll.load_more")
                 idle = 0  # Reset idle counter after clicking
+                last_growth = time.time()
         except Exception:
             pass
 
-        if idle >= max_idle:
-            print(f"No new companies loaded for {max_idle} consecutive checks. Stopping...")
+        if idle >= max_idle and time.time() - last_growth >= idle_window:
+            print(f"No new companies loaded for {idle} consecutive checks ({time.time() - last_growth:.0f}s). Stopping...")
             break
         if time.time() - start > timeout:
             print(f"Timeout of {timeout}s reached. Stopping...")
             break
 
+    if harvest:
+        # Pick up anything added by the last scroll
+        _harvest_new_cards(driver, harvested)
+        return list(harvested.values())
 
-def parse_company_cards(driver):
-    items = []
-    seen = set()
 
-    # Company cards are anchor links to /companies/<slug>
-    links = driver.find_elements(By.CSS_SELECTOR, "a[href^='/companies/']")
-    for a in links:
-        href = a.get_attribute("href")
-        if not href or href in seen or href == "https://www.ycombinator.com/companies/founders":
+# Card heuristics shared by the WebDriver and in-browser JS extraction paths
+CARD_NAME_XPATH = ".//*[@class='_coName_i9oky_470' or contains(@class,'coName')][string-length(normalize-space(.))>0]"
+CARD_BLURB_XPATH = ".//div[@class='mb-1.5 text-sm']//span[string-length(normalize-space(.))>0]"
+CARD_LOCATION_XPATH = ".//*[@class='_coLocation_i9oky_486'][string-length(normalize-space(.))>0]"
+
+# Collects every card's raw href/name/blurb/location text in a single roundtrip.
+# Uses the same XPath expressions as the WebDriver path so both agree on what they find.
+_CARDS_JS = """
+const [nameXp, blurbXp, locXp] = arguments;
+function textAt(xp, ctx) {
+    const el = document.evaluate(xp, ctx, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    return el ? (el.innerText || el.textContent || "") : null;
+}
+const out = [];
+for (const a of document.querySelectorAll("a[href^='/companies/']")) {
+    out.push({
+        href: a.href,
+        name: textAt(nameXp, a),
+        blurb: textAt(blurbXp, a),
+        location: textAt(locXp, a),
+    });
+}
+return JSON.stringify(out);
+"""
+
+# Installs a MutationObserver that queues each company anchor the first time its href appears
+_CARD_OBSERVER_JS = """
+if (window.__ycCardHarvest) return;
+const h = window.__ycCardHarvest = {seen: new Set(), queue: []};
+const SELECTOR = "a[href^='/companies/']";
+function take(a) {
+    const href = a.href;
+    if (href && !h.seen.has(href)) {
+        h.seen.add(href);
+        h.queue.push(a);
+    }
+}
+function scan(node) {
+    if (node.nodeType !== 1 && node !== document) return;
+    if (node.matches && node.matches(SELECTOR)) take(node);
+    node.querySelectorAll(SELECTOR).forEach(take);
+}
+scan(document);
+h.observer = new MutationObserver((mutations) => {
+    for (const m of mutations) {
+        if (m.type === "attributes") scan(m.target);
+        else m.addedNodes.forEach(scan);
+    }
+});
+h.observer.observe(document.body, {childList: true, subtree: true, attributes: true, attributeFilter: ["href"]});
+"""
+
+# Drains the observer queue, extracting the same fields as _CARDS_JS for the new cards only
+_DRAIN_CARDS_JS = """
+const [nameXp, blurbXp, locXp] = arguments;
+const h = window.__ycCardHarvest;
+if (!h) return null;
+function textAt(xp, ctx) {
+    const el = document.evaluate(xp, ctx, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    return el ? (el.innerText || el.textContent || "") : null;
+}
+return JSON.stringify(h.queue.splice(0).map((a) => ({
+    href: a.href,
+    name: textAt(nameXp, a),
+    blurb: textAt(blurbXp, a),
+    location: textAt(locXp, a),
+})));
+"""
+
+
+def _install_card_observer(driver):
+    driver.execute_script(_CARD_OBSERVER_JS)
+
+
+def _harvest_new_cards(driver, harvested):
+    """Add rows for cards queued since the last call to harvested ({company_url: row})."""
+    raw = driver.execute_script(_DRAIN_CARDS_JS, CARD_NAME_XPATH, CARD_BLURB_XPATH, CARD_LOCATION_XPATH)
+    if raw is None:
+        # Page was reloaded and the observer lost; reinstall (it rescans the whole page once)
+        _install_card_observer(driver)
+        raw = driver.execute_script(_DRAIN_CARDS_JS, CARD_NAME_XPATH, CARD_BLURB_XPATH, CARD_LOCATION_XPATH)
+    for card in json.loads(raw or "[]"):
+        href = card.get("href")
+        if not href or href in harvested or href == FOUNDERS_URL:
             continue
+        harvested[href] = _company_row_from_card(href, card.get("name"), card.get("blurb"), card.get("location"))
 
-        # Heuristic: the anchor often wraps the card; extract name, blurb, tags within
-        name = None
-        blurb = None
-        locations = None
 
-        # Prefer stable heading tags, fall back to hashed class if present
-        try:
-            name_el = a.find_element(By.XPATH, ".//*[@class='_coName_i9oky_470' or contains(@class,'coName')][string-length(normalize-space(.))>0]")
-            name = name_el.text.strip() or None
-        except Exception:
-          pass
+class _Record:
+    """Slotted record with just enough of the dict interface (get, [], keys) for
+    code that handles rows and jobs generically. to_dict() gives the output schema."""
 
-        try:
-          # span inside div with class "mb-1.5 text-sm"
-            blurb_el = a.find_element(By.XPATH, ".//div[@class='mb-1.5 text-sm']//span[string-length(normalize-space(.))>0]")
-            # print(blurb_el.text.strip())
-            txt = blurb_el.text.strip()
-            if txt and len(txt) <= 250:
-                blurb = txt
-        except Exception:
-            pass
+    __slots__ = ()
+
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            setattr(self, name, fields.get(name))
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(**{name: d.get(name) for name in cls.__slots__})
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def keys(self):
+        return self.__slots__
+
+    def get(self, name, default=None):
+        return getattr(self, name, default)
 
+    def __getitem__(self, name):
         try:
-            # tokens/labels for locations often appear as chips or spans
-            loc_el = a.find_element(By.XPATH, ".//*[@class='_coLocation_i9oky_486'][string-length(normalize-space(.))>0]")
-            ltxt = loc_el.text.strip()
-            # location currently formatted like this "locations": "San Francisco, CA, USA"
-            # goal: "locations": {"city": "San Francisco", "state": "CA", "country": "USA"}
-            if ltxt and len(ltxt) <= 120:
-                locations = ltxt
-                locations = locations.split(", ")
-                locations = {
-                    "city": locations[0],
-                    "state": locations[1],
-                    "country": locations[2],
-                }
-        except Exception:
-            pass
+            return getattr(self, name)
+        except AttributeError:
+            raise KeyError(name) from None
 
-        items.append({
-            "company_name": name,
-            "company_url": href,
-            "blurb": blurb,
-            "locations": locations,
-        })
-        seen.add(href)
+    def __setitem__(self, name, value):
+        setattr(self, name, value)
 
-    return items
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
 
 
-def scrape_jobs_for_company(driver, company_url, company_name):
-    """Scrape all jobs for a single company."""
-    jobs = []
-    jobs_url = company_url + "/jobs"
-    
-    try:
-        driver.get(jobs_url)
-        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-        time.sleep(0.5)
-        
-        # Find job containers by looking for divs with class APPLY and getting parent
-        job_elements = driver.find_elements(By.XPATH, "//div[contains(@class, 'APPLY')]/..")
-        
-        for job_el in job_elements:
-            try:
-                # Extract job title and URL from the link
-                job_title = None
-                job_url = None
-                try:
-                    title_link = job_el.find_element(By.XPATH, ".//a[contains(@href, '/jobs/')]")
-                    job_url = title_link.get_attribute("href")
-                    job_title = title_link.text.strip()
-                except:
-                    continue
-                
-                if not job_title:
-                    continue
-                
-                # Extract location, salary, and experience from the detail divs
-                location = None
-                salary = None
-                experience = None
-                
-                try:
-                    detail_divs = job_el.find_elements(By.XPATH, ".//div[@class='justify-left flex flex-row flex-wrap gap-x-2 gap-y-0 pr-2']/div")
-                    for div in detail_divs:
-                        text = div.text.strip()
-                        if not text:
-                            continue
-                        
-                        # Salary: contains $ and K
-                        if '$' in text and 'K' in text:
-                            salary = text
-                        # Experience: contains "years" or ends with "+" or has "Any (new grads ok)" 
-                        elif 'year' in text.lower() or text.endswith('+') or 'new grad' in text.lower():
-                            experience = text
-                        # Location: first one that's not salary or experience
-                        elif not location and not '$' in text:
-                            print('THIS IS THE LOCATION', text)
-                            location = text
-                except Exception:
-                    pass
-                
-                # Extract date posted from job URL
-                date_posted = None
-                date_posted_str = None
-                if job_url:
-                    try:
-                        # Open job URL in new tab
-                        driver.execute_script("window.open(arguments[0], '_blank');", job_url)
-                        WebDriverWait(driver, 10).until(lambda d: len(d.window_handles) > 1)
-                        handles = driver.window_handles
-                        driver.switch_to.window(handles[-1])
-                        WebDriverWait(driver, 20).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-                        
-                        # Find JSON-LD script tags
-                        scripts = driver.find_elements(By.XPATH, "//script[@type='application/ld+json']")
-                        for sc in scripts:
-                            try:
-                                txt = sc.get_attribute("textContent") or sc.get_attribute("innerHTML") or ""
-                                if not txt.strip():
-                                    continue
-                                data = json.loads(txt)
-                                date_str = _find_date_posted_in_json(data)
-                                if date_str:
-                                    dt = _parse_iso_guess_to_utc(date_str)
-                                    if dt:
-                                        date_posted = dt
-                                        date_posted_str = date_str
-                                        break
-                            except Exception:
-                                continue
-                        
-                        # Close tab and switch back
-                        driver.close()
-                        driver.switch_to.window(handles[0])
-                    except Exception:
-                        # If error, make sure we're back on main window
-                        try:
-                            handles = driver.window_handles
-                            if len(handles) > 1:
-                                driver.close()
-                            driver.switch_to.window(handles[0])
-                        except:
-                            pass
-                
-                # Filter: only include jobs with year >= 2025 AND keyword match
-                if date_posted and date_posted < datetime(2025, 8, 4, tzinfo=timezone.utc):
-                    continue
-                
-                # Check for keywords in job title
-                keywords = ["engineering", "engineer", "developer"]
-                if not any(keyword in job_title.lower() for keyword in keywords):
-                    continue
+class CompanyRecord(_Record):
+    """One directory entry; slots are the companies.json/csv columns in order."""
 
-                jobs.append({
-                    "company_name": company_name,
-                    "company_url": company_url,
-                    "job_url": job_url,
-                    "job_title": job_title,
-                    "location": location,
-                    "salary": salary,
-                    "experience": experience,
-                    "date_posted": date_posted.isoformat() if date_posted else None,
-                    "date_posted_raw": date_posted_str
-                })
-                
-            except Exception:
-                continue
-                
-    except Exception:
-        # Silent fail if company has no jobs page
-        pass
-    
-    return jobs
+    __slots__ = ("company_name", "company_url", "blurb", "locations", "job_count")
 
 
-def _find_date_posted_in_json(obj):
-    """Recursively find a datePosted string in a JSON-LD structure."""
-    if isinstance(obj, dict):
-        # Direct JobPosting
-        t = obj.get("@type")
-        if (t == "JobPosting" or (isinstance(t, list) and "JobPosting" in t)) and obj.get("datePosted"):
-            return obj.get("datePosted")
-        # @graph or nested
-        if "@graph" in obj:
-            res = _find_date_posted_in_json(obj["@graph"])
-            if res:
-                return res
-        for v in obj.values():
-            res = _find_date_posted_in_json(v)
-            if res:
-                return res
-    elif isinstance(obj, list):
-        for it in obj:
-            res = _find_date_posted_in_json(it)
-            if res:
-                return res
-    return None
+class JobRecord(_Record):
+    """One job posting; slots are the jobs.json/csv columns in order."""
 
-def _parse_iso_guess_to_utc(dt_str: str) -> datetime | None:
-    if not dt_str:
-        return None
-    s = dt_str.strip()
-    try:
-        # Handle trailing Z
-        if s.endswith("Z"):
-            s = s[:-1] + "+00:00"
-        dt = datetime.fromisoformat(s)
-        if dt.tzinfo is None:
-            dt = dt.replace(tzinfo=timezone.utc)
-        else:
-            dt = dt.astimezone(timezone.utc)
-        return dt
-    except Exception:
-        # Fallback common formats
-        for fmt in ("%Y-%m-%dT%H:%M:%S%z", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d"):
+    __slots__ = ("company_name", "company_url", "job_url", "job_title", "location",
+                 "salary", "experience", "date_posted", "date_posted_raw")
+
+
+def _json_default(obj):
+    """json.dumps default= hook that serializes records as their output dicts."""
+    if isinstance(obj, _Record):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class RecordStore:
+    """Companies and jobs indexed by company_url and job_url, in insertion order.
+
+    Lookups and job_count updates are O(1). Adding a record whose URL is
+    already present keeps the first one; records without a URL are all kept.
+    """
+
+    def __init__(self):
+        self.companies = {}
+        self.jobs = {}
+        self._lock = Lock()
+
+    def add_company(self, company):
+        record = company if isinstance(company, CompanyRecord) else CompanyRecord.from_dict(company)
+        with self._lock:
+            return self.companies.setdefault(record.company_url or ("", len(self.companies)), record)
+
+    def add_companies(self, companies):
+        for company in companies:
+            self.add_company(company)
+        return self
+
+    def add_jobs(self, jobs):
+        with self._lock:
+            for job in jobs:
+                record = job if isinstance(job, JobRecord) else JobRecord.from_dict(job)
+                self.jobs.setdefault(record.job_url or ("", len(self.jobs)), record)
+
+    def company(self, company_url):
+        return self.companies.get(company_url)
+
+    def set_job_count(self, company_url, count):
+        record = self.companies.get(company_url)
+        if record is not None:
+            record.job_count = count
+
+    def iter_companies(self):
+        return iter(self.companies.values())
+
+    def iter_jobs(self):
+        return iter(self.jobs.values())
+
+    def __len__(self):
+        return len(self.companies)
+
+
+def _company_row_from_card(href, name_txt, blurb_txt, loc_txt):
+    """Apply the card heuristics to raw text pulled from one company anchor."""
+    name = (name_txt or "").strip() or None
+
+    blurb = None
+    txt = (blurb_txt or "").strip()
+    if txt and len(txt) <= 250:
+        blurb = txt
+
+    locations = None
+    ltxt = (loc_txt or "").strip()
+    if ltxt and len(ltxt) <= 120:
+        locations = _parse_location_text(ltxt)
+
+    return CompanyRecord(company_name=name, company_url=href, blurb=blurb, locations=locations)
+
+
+def _raw_cards_webdriver(driver):
+    # One WebDriver roundtrip per attribute/lookup; kept as a fallback for the JS path
+    cards = []
+    seen = set()
+    links = driver.find_elements(By.CSS_SELECTOR, "a[href^='/companies/']")
+    for a in links:
+        href = a.get_attribute("href")
+        name = blurb = location = None
+        if href and href not in seen and href != FOUNDERS_URL:
+            seen.add(href)
             try:
-                dt = datetime.strptime(dt_str, fmt)
-                if dt.tzinfo is None:
-                    dt = dt.replace(tzinfo=timezone.utc)
-                else:
-                    dt = dt.astimezone(timezone.utc)
-                return dt
+                name = a.find_element(By.XPATH, CARD_NAME_XPATH).text
             except Exception:
                 pass
-    return None
+            try:
+                blurb = a.find_element(By.XPATH, CARD_BLURB_XPATH).text
+            except Exception:
+                pass
+            try:
+                location = a.find_element(By.XPATH, CARD_LOCATION_XPATH).text
+            except Exception:
+                pass
+        cards.append({"href": href, "name": name, "blurb": blurb, "location": location})
+    return cards
 
-def scrape_jobs_worker(company_data, progress_counter, total, lock, headless=True):
-    """Worker function that creates its own driver and scrapes jobs for one company."""
-    driver = get_driver(headless=headless)
-    try:
-        company_name = company_data.get("company_name")
-        company_url = company_data.get("company_url")
-        
-        jobs = scrape_jobs_for_company(driver, company_url, company_name)
-        
-        with lock:
-            progress_counter[0] += 1
-            print(f"[{progress_counter[0]}/{total}] {company_name}: {len(jobs)} jobs")
-        
-        return {
-            "company_name": company_name,
-            "company_url": company_url,
-            "job_count": len(jobs),
-            "jobs": jobs
-        }
-    finally:
-        driver.quit()
 
+def _raw_cards_js(driver):
+    return json.loads(driver.execute_script(_CARDS_JS, CARD_NAME_XPATH, CARD_BLURB_XPATH, CARD_LOCATION_XPATH))
 
-def save_outputs(rows, out_json="companies.json", out_csv="companies.csv"):
-    with open(out_json, "w") as f:
-        json.dump(rows, f, indent=2)
 
-    fields = ["company_name", "company_url", "blurb", "locations", "job_count"]
-    with open(out_csv, "w", newline="") as f:
-        w = csv.DictWriter(f, fieldnames=fields)
-        w.writeheader()
-        for r in rows:
-            w.writerow({k: r.get(k) for k in fields})
+@instrumented("parse_company_cards")
+def parse_company_cards(driver, mode="js", store=None):
+    """Extract CompanyRecords from the loaded directory page.
 
+    mode="js" gathers every card in one execute_script call; mode="webdriver"
+    walks the anchors with individual WebDriver lookups. When a RecordStore
+    is given the records are added to it as well.
+    """
+    if mode == "js":
+        try:
+            cards = _raw_cards_js(driver)
+        except Exception as e:
+            print(f"JS card extraction failed ({e}); falling back to WebDriver lookups")
+            cards = _raw_cards_webdriver(driver)
+    else:
+        cards = _raw_cards_webdriver(driver)
 
-def save_jobs_outputs(jobs, out_json="jobs.json", out_csv="jobs.csv"):
-    with open(out_json, "w") as f:
-        json.dump(jobs, f, indent=2)
-    
-    fields = ["company_name", "company_url", "job_url", "job_title", "location", "salary", "experience", "date_posted", "date_posted_raw"]
-    with open(out_csv, "w", newline="") as f:
-        w = csv.DictWriter(f, fieldnames=fields)
-        w.writeheader()
-        for job in jobs:
-            w.writerow({k: job.get(k) for k in fields})
+    items = []
+    seen = set()
 
+    # Company cards are anchor links to /companies/<slug>
+    for card in cards:
+        href = card.get("href")
+        if not href or href in seen or href == FOUNDERS_URL:
+            continue
+        items.append(_company_row_from_card(href, card.get("name"), card.get("blurb"), card.get("location")))
+        seen.add(href)
 
-def main():
-    parser = argparse.ArgumentParser(description="Scrape YC companies with 'Is Hiring' and 'USA' filters.")
-    parser.add_argument("--headless", action="store_true", help="Run Chrome headless.")
-    parser.add_argument("--timeout", type=int, default=180)
-    parser.add_argument("--pause", type=float, default=2.0)
-    parser.add_argument("--out-json", default="companies.json")
-    parser.add_argument("--out-csv", default="companies.csv")
-    parser.add_argument("--jobs-json", default="jobs.json")
-    parser.add_argument("--jobs-csv", default="jobs.csv")
-    parser.add_argument("--scrape-jobs", action="store_true", help="Also scrape jobs for each company")
-    parser.add_argument("--workers", type=int, default=5, help="Number of parallel workers for job scraping")
-    args = parser.parse_args()
+    if store is not None:
+        store.add_companies(items)
+    return items
 
-    # Check if we should load companies from file or scrape them
-    if os.path.exists(args.out_json) and args.scrape_jobs:
-        # If jobs scraping is requested and companies.json exists, load it
-        with open(args.out_json, "r") as f:
-            rows = json.load(f)
-        print(f"Loaded {len(rows)} companies from {args.out_json}")
+
+# The directory page is backed by an Algolia index; querying it directly skips the infinite scroll.
+# The search-only key is published in the page (window.AlgoliaOpts) and rotates, so it is
+# discovered at runtime unless given via --api-key / YC_ALGOLIA_API_KEY.
+YC_ALGOLIA_APP_ID = "45BWZJ1SGC"
+YC_ALGOLIA_INDEX = "YCCompany_production"
+# Same restrictions apply_filters clicks through in the UI: "Is Hiring" and the USA region
+YC_API_FACET_FILTERS = [["isHiring:true"], ["regions:United States of America"]]
+_ALGOLIA_OPTS_RE = re.compile(r"AlgoliaOpts\s*=\s*(\{.*?\})", re.S)
+
+
+def discover_algolia_opts(session, page_url=YC_COMPANIES_URL):
+    """Read the Algolia app id and search key embedded in the directory page."""
+    resp = session.get(page_url)
+    m = _ALGOLIA_OPTS_RE.search(resp.text)
+    if not m:
+        raise RuntimeError(f"Could not find AlgoliaOpts on {page_url}; pass --api-key")
+    opts = json.loads(m.group(1))
+    return opts.get("app"), opts.get("key")
+
+
+def _company_row_from_hit(hit):
+    """Normalize a search hit to the same row shape parse_company_cards produces."""
+    href = f"{YC_COMPANIES_URL}/{hit['slug']}" if hit.get("slug") else None
+    return _company_row_from_card(href, hit.get("name"), hit.get("one_liner"), hit.get("all_locations"))
+
+
+@instrumented("fetch_companies_api")
+def fetch_companies_api(session, api_url, app_id, api_key, facet_filters=YC_API_FACET_FILTERS,
+                        hits_per_page=1000, workers=8):
+    """Fetch the filtered company directory from the search backend, pages in parallel."""
+    headers = {"X-Algolia-Application-Id": app_id, "X-Algolia-API-Key": api_key}
+
+    def fetch_page(page):
+        params = urlencode({
+            "query": "",
+            "page": page,
+            "hitsPerPage": hits_per_page,
+            "facetFilters": json.dumps(facet_filters),
+        })
+        return session.post_json(api_url, {"params": params}, headers)
+
+    # The first page tells us how many pages there are; fetch the rest concurrently
+    first = fetch_page(0)
+    pages = [first]
+    nb_pages = first.get("nbPages", 1)
+    if nb_pages > 1:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pages.extend(executor.map(fetch_page, range(1, nb_pages)))
+
+    items = []
+    seen = set()
+    for page in pages:
+        for hit in page.get("hits", []):
+            row = _company_row_from_hit(hit)
+            if not row["company_url"] or row["company_url"] in seen:
+                continue
+            items.append(row)
+            seen.add(row["company_url"])
+
+    nb_hits = first.get("nbHits")
+    if nb_hits is not None and len(items) < nb_hits:
+        # Algolia caps how deep pagination goes; say so rather than truncating silently
+        print(f"Warning: search API returned {len(items)} of {nb_hits} companies (pagination limit reached)")
+    return items
+
+
+# Job rows on /jobs pages: the parent of each "APPLY" div holds the title link and detail chips
+JOB_ROW_XPATH = "//div[contains(@class, 'APPLY')]/.."
+JOB_LINK_XPATH = ".//a[contains(@href, '/jobs/')]"
+JOB_DETAILS_CLASS = "justify-left flex flex-row flex-wrap gap-x-2 gap-y-0 pr-2"
+JOB_DETAILS_XPATH = f".//div[@class='{JOB_DETAILS_CLASS}']/div"
+JOB_KEYWORDS = ["engineering", "engineer", "developer"]
+JOB_DATE_CUTOFF = datetime(2025, 8, 4, tzinfo=timezone.utc)
+
+
+def _classify_job_details(texts):
+    """Split a job row's detail chips into (location, salary, experience)."""
+    location = None
+    salary = None
+    experience = None
+    for text in texts:
+        if not text:
+            continue
+
+        # Salary: contains $ and K
+        if '$' in text and 'K' in text:
+            salary = text
+        # Experience: contains "years" or ends with "+" or has "Any (new grads ok)" 
+        elif 'year' in text.lower() or text.endswith('+') or 'new grad' in text.lower():
+            experience = text
+        # Location: first one that's not salary or experience
+        elif not location and not '$' in text:
+            location = text
+    return location, salary, experience
+
+
+def _job_rows_webdriver(driver):
+    """Read title/url/detail chips for every job row on the loaded /jobs page."""
+    rows = []
+    job_elements = driver.find_elements(By.XPATH, JOB_ROW_XPATH)
+    for job_el in job_elements:
+        try:
+            # Extract job title and URL from the link
+            try:
+                title_link = job_el.find_element(By.XPATH, JOB_LINK_XPATH)
+                job_url = title_link.get_attribute("href")
+                job_title = title_link.text.strip()
+            except Exception:
+                continue
+
+            if not job_title:
+                continue
+
+            # Extract location, salary, and experience from the detail divs
+            texts = []
+            try:
+                for div in job_el.find_elements(By.XPATH, JOB_DETAILS_XPATH):
+                    texts.append(div.text.strip())
+            except Exception:
+                pass
+            location, salary, experience = _classify_job_details(texts)
+
+            rows.append({
+                "job_url": job_url,
+                "job_title": job_title,
+                "location": location,
+                "salary": salary,
+                "experience": experience,
+            })
+        except Exception:
+            continue
+    return rows
+
+
+@instrumented("detail_fetch_tab")
+def _fetch_date_posted_tab(driver, job_url):
+    """Open job_url in a new tab and read datePosted from its JSON-LD.
+
+    Returns (None, None) for a page without a date, and None if the page
+    couldn't be loaded.
+    """
+    date_posted = None
+    date_posted_str = None
+    loaded = False
+    try:
+        # Open job URL in new tab
+        RATE_LIMITER.acquire(job_url, kind="detail")
+        driver.execute_script("window.open(arguments[0], '_blank');", job_url)
+        WebDriverWait(driver, 10).until(lambda d: len(d.window_handles) > 1)
+        handles = driver.window_handles
+        driver.switch_to.window(handles[-1])
+        WebDriverWait(driver, 20).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+
+        if ARCHIVE is not None:
+            _capture(job_url, "detail", driver.page_source)
+
+        # Find JSON-LD script tags
+        scripts = driver.find_elements(By.XPATH, "//script[@type='application/ld+json']")
+        for sc in scripts:
+            try:
+                txt = sc.get_attribute("textContent") or sc.get_attribute("innerHTML") or ""
+                if not txt.strip():
+                    continue
+                data = json.loads(txt)
+                date_str = _find_date_posted_in_json(data)
+                if date_str:
+                    dt = _parse_iso_guess_to_utc(date_str)
+                    if dt:
+                        date_posted = dt
+                        date_posted_str = date_str
+                        break
+            except Exception:
+                continue
+        loaded = True
+
+        # Close tab and switch back
+        driver.close()
+        driver.switch_to.window(handles[0])
+    except Exception:
+        METRICS.inc("scraper_errors_total", stage="detail_fetch_tab")
+        # If error, make sure we're back on main window
+        try:
+            handles = driver.window_handles
+            if len(handles) > 1:
+                driver.close()
+            driver.switch_to.window(handles[0])
+        except Exception:
+            pass
+    return (date_posted, date_posted_str) if loaded else None
+
+
+class JobFilters:
+    """Configurable job filter pipeline.
+
+    Predicates that only need list-page fields (title, location, salary,
+    experience) run before any detail page is fetched, cheapest first; the
+    date cutoff needs datePosted and runs afterwards. Jobs missing a field
+    pass that field's filter, except the title.
+    """
+
+    # Relative cost of each predicate; detail-stage predicates need a detail fetch
+    LIST_COSTS = {"title_keywords": 1, "location": 2, "title_regex": 3, "salary": 4, "experience": 4}
+    DETAIL_COSTS = {"date_cutoff": 1}
+
+    def __init__(self, title_keywords=JOB_KEYWORDS, title_regex=None, date_cutoff=JOB_DATE_CUTOFF,
+                 locations=None, min_salary=None, max_experience=None):
+        self.title_keywords = [k.lower() for k in title_keywords or []]
+        self.title_regex = re.compile(title_regex, re.I) if title_regex else None
+        self.date_cutoff = date_cutoff
+        self.locations = [l.lower() for l in locations or []]
+        self.min_salary = min_salary
+        self.max_experience = max_experience
+
+        self.list_predicates = self._ordered(self.LIST_COSTS)
+        self.detail_predicates = self._ordered(self.DETAIL_COSTS)
+
+        self._lock = Lock()
+        self.considered = 0
+        self.fetches_avoided = 0
+        self.dropped = {name: 0 for name in [*self.LIST_COSTS, *self.DETAIL_COSTS]}
+
+    @classmethod
+    def from_config(cls, config):
+        """Build filters from a dict as loaded from --filter-config JSON."""
+        kwargs = {}
+        for key in ("title_keywords", "title_regex", "locations", "min_salary", "max_experience"):
+            if key in config:
+                kwargs[key] = config[key]
+        if "date_cutoff" in config:
+            kwargs["date_cutoff"] = _parse_iso_guess_to_utc(config["date_cutoff"]) if config["date_cutoff"] else None
+        return cls(**kwargs)
+
+    def _ordered(self, costs):
+        active = [name for name in costs if self._is_active(name)]
+        return [(name, getattr(self, "_check_" + name)) for name in sorted(active, key=costs.get)]
+
+    def _is_active(self, name):
+        return {
+            "title_keywords": bool(self.title_keywords),
+            "title_regex": self.title_regex is not None,
+            "location": bool(self.locations),
+            "salary": self.min_salary is not None,
+            "experience": self.max_experience is not None,
+            "date_cutoff": self.date_cutoff is not None,
+        }[name]
+
+    def _check_title_keywords(self, job):
+        title = job["job_title"].lower()
+        return any(keyword in title for keyword in self.title_keywords)
+
+    def _check_title_regex(self, job):
+        return bool(self.title_regex.search(job["job_title"]))
+
+    def _check_location(self, job):
+        location = (job.get("location") or "").lower()
+        return not location or any(l in location for l in self.locations)
+
+    def _check_salary(self, job):
+        _, high, _ = _parse_salary(job.get("salary"))
+        return high is None or high >= self.min_salary
+
+    def _check_experience(self, job):
+        years = _parse_experience_years(job.get("experience"))
+        return years is None or years <= self.max_experience
+
+    def _check_date_cutoff(self, job):
+        date_posted = job.get("date_posted")
+        return not date_posted or date_posted >= self.date_cutoff
+
+    def _first_failure(self, job, predicates):
+        for name, check in predicates:
+            if not check(job):
+                return name
+        return None
+
+    def split_list_stage(self, rows):
+        """Return the rows that survive the list-page predicates, counting the rest."""
+        kept = []
+        dropped = {}
+        avoided = 0
+        for row in rows:
+            failed = self._first_failure(row, self.list_predicates)
+            if failed is None:
+                kept.append(row)
+            else:
+                dropped[failed] = dropped.get(failed, 0) + 1
+                if row.get("job_url"):
+                    avoided += 1
+        with self._lock:
+            self.considered += len(rows)
+            self.fetches_avoided += avoided
+            for name, n in dropped.items():
+                self.dropped[name] += n
+        return kept
+
+    def passes_detail_stage(self, job):
+        failed = self._first_failure(job, self.detail_predicates)
+        if failed is not None:
+            with self._lock:
+                self.dropped[failed] += 1
+        return failed is None
+
+    def key(self):
+        """Stable description of the configured predicates, to tell whether earlier results still apply."""
+        return json.dumps([
+            self.title_keywords,
+            self.title_regex.pattern if self.title_regex else None,
+            self.date_cutoff.isoformat() if self.date_cutoff else None,
+            self.locations,
+            self.min_salary,
+            self.max_experience,
+        ])
+
+    def summary(self):
+        dropped = ", ".join(f"{name}={n}" for name, n in self.dropped.items() if n)
+        return (f"Filters: {self.considered} jobs considered, dropped [{dropped or 'none'}], "
+                f"{self.fetches_avoided} detail fetches avoided")
+
+
+def _build_jobs(rows, company_name, company_url, fetch_dates_posted, filters=None):
+    """Filter job rows, fetch datePosted for the survivors in one batch, and build JobRecords.
+
+    fetch_dates_posted takes a list of job URLs and returns {url: (datetime, raw)};
+    URLs it couldn't fetch may be missing.
+    """
+    if filters is None:
+        filters = JobFilters()
+
+    # Cheap list-page predicates first so rejected jobs never cost a detail fetch
+    rows = filters.split_list_stage(rows)
+
+    urls = list(dict.fromkeys(row["job_url"] for row in rows if row["job_url"]))
+    dates = fetch_dates_posted(urls) if urls else {}
+
+    jobs = []
+    for row in rows:
+        job_url = row["job_url"]
+
+        # Date posted comes from the job detail page's JSON-LD
+        date_posted, date_posted_str = dates.get(job_url, (None, None))
+        if not filters.passes_detail_stage({**row, "date_posted": date_posted}):
+            continue
+
+        jobs.append(JobRecord(
+            company_name=company_name,
+            company_url=company_url,
+            job_url=job_url,
+            job_title=row["job_title"],
+            location=row["location"],
+            salary=row["salary"],
+            experience=row["experience"],
+            date_posted=date_posted.isoformat() if date_posted else None,
+            date_posted_raw=date_posted_str,
+        ))
+    return jobs
+
+
+@instrumented("scrape_jobs_for_company")
+def scrape_jobs_for_company(driver, company_url, company_name, fetcher=None, cache=None, filters=None, page_stats=None, previous=None):
+    """Scrape all jobs for a single company.
+
+    Detail pages are fetched concurrently over HTTP when a DetailFetcher is
+    given, otherwise one browser tab at a time. A DetailCache, when given, is
+    consulted first so already-seen jobs aren't fetched again. page_stats, if
+    given, receives the number of job rows found on the page under "rows",
+    their content hash under "hash" and the page-load time under
+    "load_seconds". With a PreviousRun, a page whose hash is unchanged since
+    the last run returns last run's jobs without fetching and sets "reused".
+
+    Raises TransientScrapeError if the page itself fails to load.
+    """
+    jobs = []
+    jobs_url = company_url + "/jobs"
+
+    try:
+        RATE_LIMITER.acquire(jobs_url)
+        start = time.time()
+        driver.get(jobs_url)
+        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+        if page_stats is not None:
+            page_stats["load_seconds"] = time.time() - start
+    except (TimeoutException, WebDriverException) as e:
+        raise TransientScrapeError(f"{jobs_url}: {e.__class__.__name__}") from e
+    
+    try:
+        # Job rows usually render right away; otherwise wait for the page to settle
+        if not wait_for_element(driver, By.XPATH, JOB_ROW_XPATH, timeout=2, label="jobs.rows"):
+            wait_for_network_idle(driver, timeout=5, label="jobs.page_idle")
+        
+        if ARCHIVE is not None:
+            _capture(jobs_url, "jobs", driver.page_source)
+        rows = _job_rows_webdriver(driver)
+        page_hash = _content_hash(rows)
+        if page_stats is not None:
+            page_stats["rows"] = len(rows)
+            page_stats["hash"] = page_hash
+        unchanged = previous.unchanged_jobs(company_url, page_hash) if previous is not None else None
+        if unchanged is not None:
+            if page_stats is not None:
+                page_stats["reused"] = True
+            return unchanged
+        if fetcher is not None:
+            fetch_dates = fetcher.fetch_many
+        else:
+            def fetch_dates(urls):
+                fetched = ((url, _fetch_date_posted_tab(driver, url)) for url in urls)
+                return {url: dates for url, dates in fetched if dates is not None}
+        if cache is not None:
+            fetch_dates = cache.wrap(fetch_dates)
+        jobs = _build_jobs(rows, company_name, company_url, fetch_dates, filters)
+                
+    except Exception:
+        # Silent fail if the jobs page has no usable markup
+        METRICS.inc("scraper_errors_total", stage="scrape_jobs_for_company")
+    
+    return jobs
+
+
+# elapsed is time on the wire across redirects, excluding any rate-limiter wait
+HttpResponse = namedtuple("HttpResponse", ["status", "url", "text", "elapsed"])
+
+
+class HttpSession:
+    """Minimal keep-alive HTTP client for server-rendered pages.
+
+    Connections are pooled per (scheme, host, port) and per thread, since
+    http.client connections must not be shared between threads.
+    """
+
+    def __init__(self, timeout=20, user_agent=USER_AGENT, max_redirects=5):
+        self.timeout = timeout
+        self.user_agent = user_agent
+        self.max_redirects = max_redirects
+        self._local = local()
+
+    def _connection(self, scheme, netloc, fresh=False):
+        conns = getattr(self._local, "conns", None)
+        if conns is None:
+            conns = self._local.conns = {}
+        key = (scheme, netloc)
+        conn = conns.get(key)
+        if conn is not None and fresh:
+            conn.close()
+            conn = None
+        if conn is None:
+            cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+            conn = conns[key] = cls(netloc, timeout=self.timeout)
+        return conn
+
+    def _drop(self, scheme, netloc):
+        conns = getattr(self._local, "conns", {})
+        conn = conns.pop((scheme, netloc), None)
+        if conn is not None:
+            conn.close()
+
+    def _request(self, url, method="GET", body=None, extra_headers=None, kind="page"):
+        parts = urlsplit(url)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        headers = {
+            "User-Agent": self.user_agent,
+            "Accept": "text/html,application/xhtml+xml,application/json;q=0.9,*/*;q=0.8",
+            "Accept-Encoding": "gzip, deflate",
+            "Connection": "keep-alive",
+        }
+        if extra_headers:
+            headers.update(extra_headers)
+
+        RATE_LIMITER.acquire(url, kind)
+        start = time.time()
+
+        # A pooled connection may have been closed by the server; retry once on a fresh one
+        for attempt in range(2):
+            conn = self._connection(parts.scheme, parts.netloc, fresh=attempt > 0)
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                resp = conn.getresponse()
+                data = resp.read()
+                break
+            except (http.client.RemoteDisconnected, http.client.BadStatusLine, ConnectionResetError, BrokenPipeError):
+                self._drop(parts.scheme, parts.netloc)
+                if attempt:
+                    raise
+                METRICS.inc("scraper_retries_total", operation="http_stale_connection")
+            except Exception:
+                self._drop(parts.scheme, parts.netloc)
+                raise
+
+        if resp.will_close:
+            self._drop(parts.scheme, parts.netloc)
+
+        METRICS.inc("scraper_http_requests_total", host=parts.netloc, status=resp.status)
+        METRICS.inc("scraper_http_response_bytes_total", len(data), host=parts.netloc)
+
+        encoding = (resp.getheader("Content-Encoding") or "").lower()
+        if encoding == "gzip":
+            data = gzip.decompress(data)
+        elif encoding == "deflate":
+            data = zlib.decompress(data)
+        return resp, data, time.time() - start
+
+    def get(self, url, kind="page"):
+        """GET url, following redirects. Returns an HttpResponse with decoded text.
+
+        kind selects the RateLimiter ceiling the request counts against.
+        """
+        elapsed = 0.0
+        for _ in range(self.max_redirects + 1):
+            resp, body, seconds = self._request(url, kind=kind)
+            elapsed += seconds
+            location = resp.getheader("Location")
+            if resp.status in (301, 302, 303, 307, 308) and location:
+                url = urljoin(url, location)
+                continue
+            charset = resp.headers.get_content_charset() or "utf-8"
+            return HttpResponse(resp.status, url, body.decode(charset, errors="replace"), elapsed)
+        raise RuntimeError(f"Too many redirects for {url}")
+
+    def post_json(self, url, payload, headers=None):
+        """POST a JSON body and return the decoded JSON response; raises on non-2xx."""
+        extra = {"Content-Type": "application/json", "Accept": "application/json"}
+        if headers:
+            extra.update(headers)
+        resp, data, _ = self._request(url, "POST", json.dumps(payload).encode(), extra)
+        if not 200 <= resp.status < 300:
+            raise RuntimeError(f"POST {url} returned HTTP {resp.status}")
+        return json.loads(data.decode(resp.headers.get_content_charset() or "utf-8"))
+
+    def close(self):
+        for conn in getattr(self._local, "conns", {}).values():
+            conn.close()
+        self._local.conns = {}
+
+
+_VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+
+
+class _HtmlNode:
+    __slots__ = ("tag", "attrs", "children", "parent")
+
+    def __init__(self, tag, attrs, parent):
+        self.tag = tag
+        self.attrs = attrs
+        self.children = []
+        self.parent = parent
+
+    def iter(self):
+        """Yield descendant elements in document order."""
+        for child in self.children:
+            if isinstance(child, _HtmlNode):
+                yield child
+                yield from child.iter()
+
+    def text(self):
+        """Visible text content with whitespace collapsed, like WebElement.text."""
+        parts = []
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, str):
+                parts.append(node)
+            elif node.tag not in ("script", "style", "template"):
+                stack.extend(reversed(node.children))
+        return " ".join("".join(parts).split())
+
+
+class _TreeBuilder(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = _HtmlNode("#document", {}, None)
+        self._stack = [self.root]
+
+    def handle_starttag(self, tag, attrs):
+        node = _HtmlNode(tag, {k: (v or "") for k, v in attrs}, self._stack[-1])
+        self._stack[-1].children.append(node)
+        if tag not in _VOID_TAGS:
+            self._stack.append(node)
+
+    def handle_startendtag(self, tag, attrs):
+        node = _HtmlNode(tag, {k: (v or "") for k, v in attrs}, self._stack[-1])
+        self._stack[-1].children.append(node)
+
+    def handle_endtag(self, tag):
+        # Tolerate unclosed tags by popping back to the nearest matching open element
+        for i in range(len(self._stack) - 1, 0, -1):
+            if self._stack[i].tag == tag:
+                del self._stack[i:]
+                return
+
+    def handle_data(self, data):
+        self._stack[-1].children.append(data)
+
+
+def _parse_html(html):
+    builder = _TreeBuilder()
+    builder.feed(html)
+    builder.close()
+    return builder.root
+
+
+def _job_rows_html(html, base_url):
+    """HTML equivalent of _job_rows_webdriver for a server-rendered /jobs page."""
+    root = _parse_html(html)
+
+    # //div[contains(@class, 'APPLY')]/.. -- unique parents, in document order
+    containers = []
+    seen = set()
+    for node in root.iter():
+        if node.tag == "div" and "APPLY" in node.attrs.get("class", "") and node.parent is not None:
+            if id(node.parent) not in seen:
+                seen.add(id(node.parent))
+                containers.append(node.parent)
+
+    rows = []
+    for job_el in containers:
+        title_link = next((n for n in job_el.iter() if n.tag == "a" and "/jobs/" in n.attrs.get("href", "")), None)
+        if title_link is None:
+            continue
+        job_title = title_link.text()
+        if not job_title:
+            continue
+
+        texts = []
+        for n in job_el.iter():
+            if n.tag == "div" and n.attrs.get("class") == JOB_DETAILS_CLASS:
+                texts.extend(c.text() for c in n.children if isinstance(c, _HtmlNode) and c.tag == "div")
+        location, salary, experience = _classify_job_details(texts)
+
+        rows.append({
+            "job_url": urljoin(base_url, title_link.attrs["href"]),
+            "job_title": job_title,
+            "location": location,
+            "salary": salary,
+            "experience": experience,
+        })
+    return rows
+
+
+def _first_text(root, pred):
+    """Text of the first descendant matching pred whose text is non-empty."""
+    for node in root.iter():
+        if pred(node):
+            text = node.text()
+            if text:
+                return text
+    return None
+
+
+def _parse_company_cards_html(html, base_url):
+    """HTML equivalent of parse_company_cards for a saved directory page."""
+    root = _parse_html(html)
+    items = []
+    seen = set()
+    for a in root.iter():
+        if a.tag != "a" or not a.attrs.get("href", "").startswith("/companies/"):
+            continue
+        href = urljoin(base_url, a.attrs["href"])
+        if href in seen or href == FOUNDERS_URL:
+            continue
+        name = _first_text(a, lambda n: n.attrs.get("class") == "_coName_i9oky_470" or "coName" in n.attrs.get("class", ""))
+        blurb = None
+        for div in a.iter():
+            if div.tag == "div" and div.attrs.get("class") == "mb-1.5 text-sm":
+                blurb = _first_text(div, lambda n: n.tag == "span")
+                if blurb:
+                    break
+        location = _first_text(a, lambda n: n.attrs.get("class") == "_coLocation_i9oky_486")
+        items.append(_company_row_from_card(href, name, blurb, location))
+        seen.add(href)
+    return items
+
+
+_LD_JSON_RE = re.compile(r"<script[^>]*type=[\"']application/ld\+json[\"'][^>]*>(.*?)</script>", re.I | re.S)
+
+
+def _date_posted_from_html(html):
+    """Read datePosted from the JSON-LD blocks of a raw job detail page."""
+    for txt in _LD_JSON_RE.findall(html):
+        try:
+            if not txt.strip():
+                continue
+            date_str = _find_date_posted_in_json(json.loads(txt))
+            if date_str:
+                dt = _parse_iso_guess_to_utc(date_str)
+                if dt:
+                    return dt, date_str
+        except Exception:
+            continue
+    return None, None
+
+
+@instrumented("detail_fetch_http")
+def _fetch_date_posted_http(session, job_url):
+    """Fetch job_url and parse its datePosted.
+
+    Returns (None, None) when the page has no date or the posting is gone,
+    and None when the fetch failed and is worth trying again later.
+    """
+    try:
+        resp = session.get(job_url, kind="detail")
+        if resp.status in (404, 410):
+            return None, None
+        if resp.status != 200:
+            return None
+        # Keyed by the requested URL, which is what reparse looks up, not the redirect target
+        _capture(job_url, "detail", resp.text)
+        return _date_posted_from_html(resp.text)
+    except Exception:
+        METRICS.inc("scraper_errors_total", stage="detail_fetch_http")
+        return None
+
+
+class DetailFetcher:
+    """Fetches job detail pages concurrently and parses datePosted from their raw HTML.
+
+    Requests run on a shared thread pool so keep-alive connections are reused
+    across companies; a semaphore per host caps concurrent requests to it.
+    """
+
+    def __init__(self, session, max_workers=16, per_host=8):
+        self.session = session
+        self.per_host = per_host
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="detail")
+        self._host_limits = {}
+        self._lock = Lock()
+
+    def _host_limit(self, url):
+        host = urlsplit(url).netloc
+        with self._lock:
+            sem = self._host_limits.get(host)
+            if sem is None:
+                sem = self._host_limits[host] = BoundedSemaphore(self.per_host)
+        return sem
+
+    def _fetch(self, url):
+        with self._host_limit(url):
+            return _fetch_date_posted_http(self.session, url)
+
+    def fetch_many(self, urls):
+        """Fetch every URL at once; returns {url: (datetime, raw)} without the URLs that failed."""
+        futures = {url: self._executor.submit(self._fetch, url) for url in urls}
+        results = {}
+        for url, future in futures.items():
+            try:
+                dates = future.result()
+            except Exception:
+                continue
+            if dates is not None:
+                results[url] = dates
+        return results
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+
+class DetailCache:
+    """On-disk SQLite cache of job_url -> parsed datePosted and its raw string.
+
+    datePosted never changes for a posting, so entries only expire through the
+    TTL or when the cache grows past max_entries (least recently used first).
+    Pages that loaded without a date are cached too, as negative entries with
+    the shorter negative_ttl_days, since a date may still be added later.
+    """
+
+    def __init__(self, path, ttl_days=30, max_entries=200_000, negative_ttl_days=1):
+        self.path = path
+        self.ttl = ttl_days * 86400
+        self.negative_ttl = negative_ttl_days * 86400
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS job_details ("
+            " job_url TEXT PRIMARY KEY,"
+            " date_posted TEXT,"
+            " date_posted_raw TEXT,"
+            " fetched_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS job_details_accessed ON job_details (accessed_at)")
+        self._conn.commit()
+
+    def get_many(self, urls):
+        """Return {url: (datetime, raw)} for the URLs with a fresh entry."""
+        if not urls:
+            return {}
+        now = time.time()
+        found = {}
+        with self._lock:
+            for i in range(0, len(urls), 500):
+                chunk = urls[i:i + 500]
+                marks = ",".join("?" * len(chunk))
+                cur = self._conn.execute(
+                    f"SELECT job_url, date_posted, date_posted_raw FROM job_details"
+                    f" WHERE fetched_at >= CASE WHEN date_posted IS NULL THEN ? ELSE ? END AND job_url IN ({marks})",
+                    [now - self.negative_ttl, now - self.ttl, *chunk],
+                )
+                for url, date_posted, raw in cur:
+                    found[url] = (datetime.fromisoformat(date_posted) if date_posted else None, raw)
+            if found:
+                self._conn.executemany("UPDATE job_details SET accessed_at = ? WHERE job_url = ?", [(now, u) for u in found])
+                self._conn.commit()
+            self.hits += len(found)
+            self.misses += len(urls) - len(found)
+        return found
+
+    def put_many(self, dates):
+        """Store {url: (datetime, raw)}; entries without a parsed date become negative entries."""
+        now = time.time()
+        values = [
+            (url, dt.isoformat() if dt is not None else None, raw, now, now)
+            for url, (dt, raw) in dates.items()
+        ]
+        if not values:
+            return
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO job_details VALUES (?, ?, ?, ?, ?)", values)
+            self._conn.commit()
+
+    def wrap(self, fetch_dates_posted):
+        """Wrap a fetch_dates_posted callable so only cache misses reach it."""
+        def fetch(urls):
+            dates = self.get_many(urls)
+            missing = [u for u in urls if u not in dates]
+            if missing:
+                fetched = fetch_dates_posted(missing)
+                self.put_many(fetched)
+                dates.update(fetched)
+            return dates
+        return fetch
+
+    def evict(self):
+        """Drop expired entries, then the least recently used ones above max_entries."""
+        with self._lock:
+            now = time.time()
+            self._conn.execute(
+                "DELETE FROM job_details WHERE fetched_at < CASE WHEN date_posted IS NULL THEN ? ELSE ? END",
+                (now - self.negative_ttl, now - self.ttl),
+            )
+            self._conn.execute(
+                "DELETE FROM job_details WHERE job_url IN ("
+                " SELECT job_url FROM job_details ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            self._conn.commit()
+
+    def purge(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM job_details")
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class SnapshotArchive:
+    """Compressed, indexed archive of raw page HTML keyed by URL and fetch time.
+
+    Pages are zlib-compressed into a single SQLite file. kind is one of
+    "listing", "jobs" or "detail" so reparse can pick the right extractor;
+    "companies" holds the JSON company list a run started from.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            " url TEXT NOT NULL,"
+            " kind TEXT NOT NULL,"
+            " fetched_at REAL NOT NULL,"
+            " content BLOB NOT NULL,"
+            " PRIMARY KEY (url, fetched_at))"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS pages_kind ON pages (kind, url, fetched_at)")
+        self._conn.commit()
+
+    def put(self, url, kind, html):
+        blob = zlib.compress(html.encode("utf-8"), 6)
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?)", (url, kind, time.time(), blob))
+            self._conn.commit()
+
+    def latest(self, kind):
+        """Yield (url, compressed_html) for the most recent snapshot of each URL of this kind."""
+        cur = self._conn.execute(
+            "SELECT url, content FROM pages p WHERE kind = ? AND fetched_at = "
+            " (SELECT MAX(fetched_at) FROM pages WHERE url = p.url AND kind = p.kind)",
+            (kind,),
+        )
+        yield from cur
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# Set from --capture in main(); when present, fetched pages are archived as they are read
+ARCHIVE = None
+
+
+def _capture(url, kind, html):
+    if ARCHIVE is not None and html:
+        try:
+            ARCHIVE.put(url, kind, html)
+        except Exception as e:
+            print(f"Could not archive {url}: {e}")
+
+
+def _reparse_jobs_chunk(items):
+    """Worker-process helper: [(jobs_url, compressed_html)] -> [(company_url, job rows)]."""
+    out = []
+    for url, blob in items:
+        rows = _job_rows_html(zlib.decompress(blob).decode("utf-8"), url)
+        out.append((url[:-len("/jobs")] if url.endswith("/jobs") else url, rows))
+    return out
+
+
+def _reparse_detail_chunk(items):
+    """Worker-process helper: [(job_url, compressed_html)] -> {job_url: (iso or None, raw)}."""
+    out = {}
+    for url, blob in items:
+        dt, raw = _date_posted_from_html(zlib.decompress(blob).decode("utf-8"))
+        out[url] = (dt.isoformat() if dt else None, raw)
+    return out
+
+
+def _chunks(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def reparse_archive(args):
+    """Re-run the listing, /jobs and detail-page extraction over an archive, without a browser."""
+    archive = SnapshotArchive(args.reparse)
+    procs = args.reparse_procs or os.cpu_count()
+    store = RecordStore()
+    try:
+        for url, blob in archive.latest("companies"):
+            store.add_companies(json.loads(zlib.decompress(blob).decode("utf-8")))
+        for url, blob in archive.latest("listing"):
+            store.add_companies(_parse_company_cards_html(zlib.decompress(blob).decode("utf-8"), url))
+        if not len(store) and os.path.exists(args.out_json):
+            # Archives from before company lists were captured: use the companies we already have
+            with open(args.out_json, "r") as f:
+                store.add_companies(json.load(f))
+        print(f"Reparsed {len(store)} companies from the archive")
+
+        with ProcessPoolExecutor(max_workers=procs) as executor:
+            dates = {}
+            for part in executor.map(_reparse_detail_chunk, _chunks(archive.latest("detail"), 200)):
+                dates.update(part)
+            job_pages = [r for part in executor.map(_reparse_jobs_chunk, _chunks(archive.latest("jobs"), 50)) for r in part]
+    finally:
+        archive.close()
+
+    filters = _filters_from_args(args)
+
+    def fetch_dates(urls):
+        return {
+            u: (datetime.fromisoformat(dates[u][0]) if dates[u][0] else None, dates[u][1])
+            for u in urls if u in dates
+        }
+
+    for company in store.iter_companies():
+        company.job_count = 0
+    for company_url, job_rows in job_pages:
+        company = store.company(company_url)
+        jobs = _build_jobs(job_rows, company.company_name if company else None, company_url, fetch_dates, filters)
+        store.add_jobs(jobs)
+        store.set_job_count(company_url, len(jobs))
+
+    if len(store):
+        total_jobs = save_run_outputs(args, store.iter_companies(), store.iter_jobs())
     else:
-        # Otherwise scrape companies
-        driver = get_driver(headless=args.headless)
+        print(f"No companies in the archive or {args.out_json}; leaving {args.out_json} untouched")
+        total_jobs = save_jobs_outputs(store, out_json=args.jobs_json, out_csv=args.jobs_csv)
+    print(filters.summary())
+    print(f"Reparsed {total_jobs} jobs from {len(job_pages)} jobs pages and {len(dates)} detail pages")
+
+
+@instrumented("scrape_jobs_for_company_http")
+def scrape_jobs_for_company_http(session, company_url, company_name, fetcher=None, cache=None, filters=None, page_stats=None, previous=None):
+    """Scrape jobs from server-rendered HTML without a browser.
+
+    Returns None when the page doesn't contain the job markup (e.g. it is
+    rendered client-side), so the caller can fall back to Selenium. Raises
+    TransientScrapeError on connection errors, 429 and 5xx responses.
+    """
+    jobs_url = company_url + "/jobs"
+    try:
+        resp = session.get(jobs_url)
+    except Exception as e:
+        METRICS.inc("scraper_errors_total", stage="scrape_jobs_for_company_http")
+        raise TransientScrapeError(f"{jobs_url}: {e.__class__.__name__}") from e
+    if resp.status == 429 or resp.status >= 500:
+        raise TransientScrapeError(f"{jobs_url}: HTTP {resp.status}")
+    if page_stats is not None:
+        page_stats["load_seconds"] = resp.elapsed
+    if resp.status == 404:
+        # Same as the Selenium path: no jobs page means no jobs
+        if page_stats is not None:
+            page_stats["rows"] = 0
+        return []
+    if resp.status != 200:
+        return None
+
+    _capture(jobs_url, "jobs", resp.text)
+    rows = _job_rows_html(resp.text, resp.url)
+    if not rows:
+        return None
+    page_hash = _content_hash(rows)
+    if page_stats is not None:
+        page_stats["rows"] = len(rows)
+        page_stats["hash"] = page_hash
+    unchanged = previous.unchanged_jobs(company_url, page_hash) if previous is not None else None
+    if unchanged is not None:
+        if page_stats is not None:
+            page_stats["reused"] = True
+        return unchanged
+    own_fetcher = fetcher is None
+    if own_fetcher:
+        fetcher = DetailFetcher(session)
+    fetch_dates = fetcher.fetch_many
+    if cache is not None:
+        fetch_dates = cache.wrap(fetch_dates)
+    try:
+        return _build_jobs(rows, company_name, company_url, fetch_dates, filters)
+    finally:
+        if own_fetcher:
+            fetcher.close()
+
+
+def _find_date_posted_in_json(obj):
+    """Recursively find a datePosted string in a JSON-LD structure."""
+    if isinstance(obj, dict):
+        # Direct JobPosting
+        t = obj.get("@type")
+        if (t == "JobPosting" or (isinstance(t, list) and "JobPosting" in t)) and obj.get("datePosted"):
+            return obj.get("datePosted")
+        # @graph or nested
+        if "@graph" in obj:
+            res = _find_date_posted_in_json(obj["@graph"])
+            if res:
+                return res
+        for v in obj.values():
+            res = _find_date_posted_in_json(v)
+            if res:
+                return res
+    elif isinstance(obj, list):
+        for it in obj:
+            res = _find_date_posted_in_json(it)
+            if res:
+                return res
+    return None
+
+def scrape_jobs_worker(company_data, progress_counter, total, lock, pool, session=None, fetcher=None, cache=None, filters=None, previous=None, store=None):
+    """Worker function that scrapes jobs for one company.
+
+    With a session, the browserless HTTP engine is tried first; otherwise (or
+    when the markup isn't server-rendered) the thread's pooled driver is used.
+    A fetcher, when given, loads job detail pages over HTTP instead of in tabs,
+    a cache skips detail pages seen on earlier runs, and a PreviousRun skips
+    companies whose /jobs page hasn't changed. The company's job_count is
+    updated in store, if given.
+    """
+    company_name = company_data.get("company_name")
+    company_url = company_data.get("company_url")
+
+    jobs = None
+    page_stats = {}
+    if session is not None:
+        jobs = scrape_jobs_for_company_http(session, company_url, company_name, fetcher, cache, filters, page_stats, previous)
+
+    if jobs is None:
+        driver = pool.acquire()
         try:
-            driver.get(YC_COMPANIES_URL)
-            WebDriverWait(driver, 30).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-            time.sleep(2)
+            jobs = scrape_jobs_for_company(driver, company_url, company_name, fetcher, cache, filters, page_stats, previous)
+        except TransientScrapeError:
+            # Page load failed; the pool's health check decides whether the driver survives
+            raise
+        except Exception:
+            # Driver is in an unknown state; drop it so the next company gets a fresh one
+            METRICS.inc("scraper_driver_recycles_total", reason="error")
+            pool.discard()
+            raise
+
+    if store is not None:
+        store.set_job_count(company_url, len(jobs))
+    with lock:
+        progress_counter[0] += 1
+        print(f"[{progress_counter[0]}/{total}] {company_name}: {len(jobs)} jobs")
+
+    return {
+        "company_name": company_name,
+        "company_url": company_url,
+        "job_count": len(jobs),
+        "rows_seen": page_stats.get("rows", 0),
+        "page_hash": page_stats.get("hash"),
+        # Only pages that were actually parsed say anything about server latency
+        "load_seconds": None if page_stats.get("reused") or not page_stats.get("rows") else page_stats.get("load_seconds"),
+        "jobs": jobs
+    }
+
+
+class TransientScrapeError(Exception):
+    """A page failed to load in a way that is worth retrying (timeouts, 429, 5xx)."""
+
+
+class RateLimiter:
+    """Per-host requests-per-second ceilings shared by every thread.
+
+    Each kind of request ("page" for listing and /jobs page loads, "detail"
+    for job detail pages) has its own ceiling and its own schedule per host,
+    so a burst of detail fetches doesn't starve page loads or vice versa.
+    Requests of one kind to a host are spaced at least 1/rps apart; acquire()
+    sleeps until the caller's slot. A kind missing from rps is not limited.
+    """
+
+    def __init__(self, rps=None):
+        self.rps = rps or {}
+        self._lock = Lock()
+        self._next = {}
+
+    def acquire(self, url, kind="page"):
+        rps = self.rps.get(kind)
+        if not rps:
+            return
+        key = (urlsplit(url).netloc, kind)
+        with self._lock:
+            now = time.time()
+            slot = max(now, self._next.get(key, 0.0))
+            self._next[key] = slot + 1.0 / rps
+        if slot > now:
+            time.sleep(slot - now)
+
+
+RATE_LIMITER = RateLimiter()
+
+
+class AdaptiveScheduler:
+    """AIMD concurrency controller for page-load work.
+
+    The number of in-flight tasks grows by one per "round" of healthy results
+    and is cut multiplicatively when the recent window shows errors, empty
+    pages, or a median latency well above the baseline: a decaying average
+    (EWMA) of the latencies that have left the window, so the window is judged
+    against what came before it and one fast outlier can't make every later
+    result look slow.
+    Tasks that raise TransientScrapeError are retried with jittered
+    exponential backoff.
+    """
+
+    def __init__(self, max_workers, min_workers=1, initial=None, window=20,
+                 error_threshold=0.1, empty_threshold=0.5, latency_factor=3.0, baseline_alpha=0.05,
+                 decrease=0.5, max_retries=3, backoff_base=2.0, backoff_max=60.0):
+        self.max_workers = max_workers
+        # At least one slot, otherwise nothing could ever be submitted again
+        self.min_workers = max(1, min_workers)
+        self.limit = float(initial or max(self.min_workers, max_workers // 2))
+        self.window = deque(maxlen=window)
+        self.error_threshold = error_threshold
+        self.empty_threshold = empty_threshold
+        self.latency_factor = latency_factor
+        self.baseline_alpha = baseline_alpha
+        self.decrease = decrease
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.baseline_latency = None
+        self._last_decrease = 0.0
+
+    def _absorb(self, latency):
+        if latency is None:
+            return
+        if self.baseline_latency is None:
+            self.baseline_latency = latency
+        else:
+            self.baseline_latency += self.baseline_alpha * (latency - self.baseline_latency)
+
+    def _record(self, duration, error, empty, latency=None):
+        """Feed one outcome to the controller.
+
+        duration is the task's wall-clock time; latency the per-request time
+        the slow check uses (None leaves the result out of it). Errors and
+        empty pages never count towards latency.
+        """
+        if error or empty:
+            latency = None
+        if len(self.window) == self.window.maxlen:
+            self._absorb(self.window[0][1])
+        self.window.append((duration, latency, error, empty))
+
+        n = len(self.window)
+        error_rate = sum(1 for _, _, e, _ in self.window if e) / n
+        empty_rate = sum(1 for _, _, e, m in self.window if m and not e) / n
+        latencies = sorted(l for _, l, _, _ in self.window if l is not None)
+        median = latencies[len(latencies) // 2] if latencies else None
+        durations = sorted(d for d, _, e, _ in self.window if not e)
+        typical = durations[len(durations) // 2] if durations else duration
+        slow = (median is not None and self.baseline_latency is not None
+                and len(latencies) >= self.window.maxlen // 4
+                and median > self.latency_factor * self.baseline_latency)
+
+        overloaded = error or (n >= self.window.maxlen // 2 and (
+            error_rate > self.error_threshold or empty_rate > self.empty_threshold or slow))
+        now = time.time()
+        if overloaded:
+            # At most one cut per typical task duration, so one burst doesn't collapse the limit
+            if now - self._last_decrease >= typical:
+                self.limit = max(self.min_workers, self.limit * self.decrease)
+                self._last_decrease = now
+                # A lasting slowdown becomes the new baseline instead of cutting again and again
+                for _, l, _, _ in self.window:
+                    self._absorb(l)
+                self.window.clear()
+        else:
+            # Additive increase: about +1 after `limit` healthy completions
+            self.limit = min(self.max_workers, self.limit + 1.0 / self.limit)
+        METRICS.inc("scraper_scheduler_adjustments_total", direction="down" if overloaded else "up")
+
+    def _backoff(self, attempt):
+        delay = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return delay * random.uniform(0.5, 1.0)
+
+    def run(self, items, fn, on_result, on_error, is_empty=lambda result: False, latency_of=None):
+        """Call fn(item) for every item on a thread pool, feeding results to on_result(item, result).
+
+        on_error(item, exc) is called for non-transient failures and for
+        transient ones that ran out of retries. latency_of(result), if given,
+        returns the per-request time to judge load by (None to skip the
+        result); otherwise the task's wall-clock time is used.
+        """
+        queue = deque((item, 0, 0.0) for item in items)
+        in_flight = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while queue or in_flight:
+                now = time.time()
+                # Fill free slots with tasks whose backoff has elapsed
+                deferred = []
+                while queue and len(in_flight) < int(self.limit):
+                    item, attempt, ready_at = queue.popleft()
+                    if ready_at > now:
+                        deferred.append((item, attempt, ready_at))
+                        continue
+                    in_flight[executor.submit(fn, item)] = (item, attempt, time.time())
+                queue.extendleft(reversed(deferred))
+
+                if not in_flight:
+                    # Everything left is backing off
+                    time.sleep(max(0.0, min(r for _, _, r in queue) - time.time()))
+                    continue
+
+                next_ready = min((r for _, _, r in queue), default=None)
+                timeout = max(0.05, next_ready - time.time()) if next_ready else None
+                done, _ = wait(in_flight, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    item, attempt, started = in_flight.pop(future)
+                    duration = time.time() - started
+                    try:
+                        result = future.result()
+                    except TransientScrapeError as e:
+                        self._record(duration, True, False)
+                        if attempt < self.max_retries:
+                            METRICS.inc("scraper_retries_total", operation="company")
+                            queue.append((item, attempt + 1, time.time() + self._backoff(attempt)))
+                        else:
+                            on_error(item, e)
+                        continue
+                    except Exception as e:
+                        self._record(duration, True, False)
+                        on_error(item, e)
+                        continue
+                    latency = latency_of(result) if latency_of is not None else duration
+                    self._record(duration, False, is_empty(result), latency)
+                    on_result(item, result)
+
+
+class JobCheckpoint:
+    """Append-only JSONL log of per-company job results.
+
+    Each completed company is written as one line as soon as its future
+    finishes, so a crashed run can be resumed and the final outputs can be
+    streamed from disk instead of held in memory.
+    """
+
+    def __init__(self, path, resume=False):
+        self.path = path
+        self.completed = set()
+        if resume and os.path.exists(path):
+            for result in self.iter_results():
+                self.completed.add(result["company_url"])
+            self._f = open(path, "a")
+            # A crash mid-write can leave a partial last line; start on a fresh one
+            if self._f.tell() > 0:
+                with open(path, "rb") as rf:
+                    rf.seek(-1, os.SEEK_END)
+                    if rf.read(1) != b"\n":
+                        self._f.write("\n")
+        else:
+            self._f = open(path, "w")
+
+    def append(self, result):
+        self._f.write(json.dumps(result, default=_json_default) + "\n")
+        self._f.flush()
+        self.completed.add(result["company_url"])
+
+    def iter_results(self):
+        """Yield each company result once, skipping unreadable (truncated) lines."""
+        seen = set()
+        with open(self.path, "r") as f:
+            for line in f:
+                try:
+                    result = json.loads(line)
+                except ValueError:
+                    continue
+                if result.get("company_url") in seen:
+                    continue
+                seen.add(result.get("company_url"))
+                yield result
+
+    def iter_jobs(self):
+        for result in self.iter_results():
+            yield from result["jobs"]
+
+    def job_counts(self):
+        return {r["company_url"]: r["job_count"] for r in self.iter_results()}
+
+    def close(self):
+        self._f.close()
+
+
+def _write_json_array(f, items):
+    """Stream items as a JSON array formatted like json.dump(..., indent=2). Returns the count."""
+    n = 0
+    for item in items:
+        f.write("[\n  " if n == 0 else ",\n  ")
+        f.write(json.dumps(item, indent=2, default=_json_default).replace("\n", "\n  "))
+        n += 1
+    f.write("\n]" if n else "[]")
+    return n
+
+
+def save_outputs(rows, out_json="companies.json", out_csv="companies.csv"):
+    """Write companies to JSON and CSV in a single pass; rows may be a RecordStore or any iterable of records or dicts."""
+    if isinstance(rows, RecordStore):
+        rows = rows.iter_companies()
+    fields = list(CompanyRecord.__slots__)
+    with open(out_json, "w") as jf, open(out_csv, "w", newline="") as cf:
+        w = csv.DictWriter(cf, fieldnames=fields)
+        w.writeheader()
+
+        def rows_and_csv():
+            for r in rows:
+                w.writerow({k: r.get(k) for k in fields})
+                yield r
+
+        return _write_json_array(jf, rows_and_csv())
+
+
+def save_jobs_outputs(jobs, out_json="jobs.json", out_csv="jobs.csv"):
+    """Write jobs to JSON and CSV in a single pass; jobs may be a RecordStore or any iterable, e.g. JobCheckpoint.iter_jobs()."""
+    if isinstance(jobs, RecordStore):
+        jobs = jobs.iter_jobs()
+    fields = list(JobRecord.__slots__)
+    with open(out_json, "w") as jf, open(out_csv, "w", newline="") as cf:
+        w = csv.DictWriter(cf, fieldnames=fields)
+        w.writeheader()
+
+        def jobs_and_csv():
+            for job in jobs:
+                w.writerow({k: job.get(k) for k in fields})
+                yield job
+
+        return _write_json_array(jf, jobs_and_csv())
+
+
+def _content_hash(obj):
+    default = lambda o: o.to_dict() if isinstance(o, _Record) else str(o)
+    return hashlib.sha1(json.dumps(obj, sort_keys=True, default=default).encode("utf-8")).hexdigest()
+
+
+def _load_json(path, default):
+    if not path or not os.path.exists(path):
+        return default
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def _delta_path(out_json):
+    return os.path.splitext(out_json)[0] + ".delta.jsonl"
+
+
+class PreviousRun:
+    """The previous run's outputs and manifest, indexed for --delta.
+
+    companies and jobs map company_url / job_url to last run's records.
+    Manifest page hashes are only trusted when the filters are the same as
+    last time, since the saved jobs were filtered with them.
+    """
+
+    def __init__(self, manifest_path, companies_json, jobs_json, filters_key=None):
+        self.manifest = _load_json(manifest_path, {})
+        self.companies = {c["company_url"]: c for c in _load_json(companies_json, []) if c.get("company_url")}
+        self.jobs = {}
+        self.jobs_by_company = {}
+        for job in _load_json(jobs_json, []):
+            self.jobs[job.get("job_url")] = job
+            self.jobs_by_company.setdefault(job.get("company_url"), []).append(job)
+        self.page_hashes = self.manifest.get("pages", {}) if self.manifest.get("filters") == filters_key else {}
+        self._lock = Lock()
+        self.reused = 0
+
+    def unchanged_jobs(self, company_url, page_hash):
+        """Last run's jobs for company_url if its /jobs rows hash the same, else None."""
+        if self.page_hashes.get(company_url) != page_hash:
+            return None
+        with self._lock:
+            self.reused += 1
+        return [JobRecord.from_dict(job) for job in self.jobs_by_company.get(company_url, [])]
+
+
+class DeltaWriter:
+    """Compare records streamed through feed() against last run's index and
+    write one JSONL line per added, changed or removed record.
+
+    Changed records list every field that differs as {"old": ..., "new": ...}.
+    Records whose content hash matches the previous manifest are skipped
+    without comparing fields. hashes collects the new manifest entries.
+    """
+
+    def __init__(self, path, key, previous, previous_hashes=None):
+        self.key = key
+        self.previous = previous
+        self.previous_hashes = previous_hashes or {}
+        self.hashes = {}
+        self.counts = {"added": 0, "changed": 0, "removed": 0}
+        self._f = open(path, "w")
+
+    def _write(self, op, key, **fields):
+        self._f.write(json.dumps({"op": op, self.key: key, **fields}, default=_json_default) + "\n")
+        self.counts[op] += 1
+
+    def feed(self, records):
+        for record in records:
+            key = record.get(self.key)
+            digest = _content_hash(record)
+            self.hashes[key] = digest
+            old = self.previous.get(key)
+            if old is None:
+                self._write("added", key, record=record)
+            elif self.previous_hashes.get(key) != digest:
+                changes = {f: {"old": old.get(f), "new": record.get(f)}
+                           for f in sorted(old.keys() | record.keys()) if old.get(f) != record.get(f)}
+                if changes:
+                    self._write("changed", key, changes=changes)
+            yield record
+
+    def close(self):
+        for key, old in self.previous.items():
+            if key not in self.hashes:
+                self._write("removed", key, record=old)
+        self._f.close()
+
+    def summary(self):
+        return ", ".join(f"{n} {op}" for op, n in self.counts.items())
+
+
+def _split_location(value):
+    """(city, state, country) from a "City, ST, Country" string or a parsed location dict."""
+    if isinstance(value, str):
+        value = _parse_location_text(value)
+    if isinstance(value, dict):
+        return value.get("city"), value.get("state"), value.get("country")
+    return None, None, None
+
+
+def _location_text(value):
+    if isinstance(value, dict):
+        return ", ".join(v for v in (value.get("city"), value.get("state"), value.get("country")) if v)
+    if isinstance(value, list):
+        return ", ".join(value)
+    return value
+
+
+def _company_schema():
+    return pa.schema([
+        ("company_name", pa.string()),
+        ("company_url", pa.string()),
+        ("blurb", pa.string()),
+        ("location", pa.string()),
+        ("city", pa.string()),
+        ("state", pa.string()),
+        ("country", pa.string()),
+        ("job_count", pa.int32()),
+    ])
+
+
+def _company_columns(batch):
+    places = [_location_text(c.get("locations")) for c in batch]
+    split = [_split_location(c.get("locations")) for c in batch]
+    return {
+        "company_name": [c.get("company_name") for c in batch],
+        "company_url": [c.get("company_url") for c in batch],
+        "blurb": [c.get("blurb") for c in batch],
+        "location": places,
+        "city": [p[0] for p in split],
+        "state": [p[1] for p in split],
+        "country": [p[2] for p in split],
+        "job_count": [c.get("job_count") for c in batch],
+    }
+
+
+def _job_schema():
+    return pa.schema([
+        ("company_name", pa.string()),
+        ("company_url", pa.string()),
+        ("job_url", pa.string()),
+        ("job_title", pa.string()),
+        ("location", pa.string()),
+        ("city", pa.string()),
+        ("state", pa.string()),
+        ("country", pa.string()),
+        ("salary", pa.string()),
+        ("salary_min", pa.float64()),
+        ("salary_max", pa.float64()),
+        ("salary_currency", pa.string()),
+        ("experience", pa.string()),
+        ("experience_years", pa.int32()),
+        ("date_posted", pa.timestamp("us", tz="UTC")),
+        ("date_posted_raw", pa.string()),
+    ])
+
+
+def _job_columns(batch):
+    """Typed columns for a batch of jobs. Each distinct salary, experience,
+    location and date string in the batch is parsed once."""
+    salaries = {t: _parse_salary(t) for t in {j.get("salary") for j in batch}}
+    years = {t: _parse_experience_years(t) for t in {j.get("experience") for j in batch}}
+    places = {t: _split_location(t) for t in {j.get("location") for j in batch}}
+    dates = {t: _parse_iso_guess_to_utc(t) for t in {j.get("date_posted") for j in batch}}
+    return {
+        "company_name": [j.get("company_name") for j in batch],
+        "company_url": [j.get("company_url") for j in batch],
+        "job_url": [j.get("job_url") for j in batch],
+        "job_title": [j.get("job_title") for j in batch],
+        "location": [j.get("location") for j in batch],
+        "city": [places[j.get("location")][0] for j in batch],
+        "state": [places[j.get("location")][1] for j in batch],
+        "country": [places[j.get("location")][2] for j in batch],
+        "salary": [j.get("salary") for j in batch],
+        "salary_min": [salaries[j.get("salary")][0] for j in batch],
+        "salary_max": [salaries[j.get("salary")][1] for j in batch],
+        "salary_currency": [salaries[j.get("salary")][2] for j in batch],
+        "experience": [j.get("experience") for j in batch],
+        "experience_years": [years[j.get("experience")] for j in batch],
+        "date_posted": [dates[j.get("date_posted")] for j in batch],
+        "date_posted_raw": [j.get("date_posted_raw") for j in batch],
+    }
+
+
+_COLUMNAR = {"companies": (_company_schema, _company_columns), "jobs": (_job_schema, _job_columns)}
+
+
+class ColumnarWriter:
+    """Stream records passed through feed() into a typed Parquet file, one row
+    group per batch_size records. Paths ending in .arrow or .feather are
+    written as an Arrow IPC file instead.
+
+    Row groups carry min/max statistics, so readers filtering on columns like
+    salary_min or date_posted can skip whole batches.
+    """
+
+    def __init__(self, path, kind, batch_size=50_000):
+        schema, self.columns = _COLUMNAR[kind]
+        self.path = path
+        self.schema = schema()
+        self.batch_size = batch_size
+        self.rows = 0
+        self._batch = []
+        if path.endswith((".arrow", ".feather")):
+            self._writer = pa.ipc.new_file(path, self.schema)
+        else:
+            self._writer = pq.ParquetWriter(path, self.schema, compression="zstd")
+
+    def feed(self, records):
+        for record in records:
+            self._batch.append(record)
+            if len(self._batch) >= self.batch_size:
+                self._flush()
+            yield record
+
+    def _flush(self):
+        if self._batch:
+            self._writer.write_table(pa.Table.from_pydict(self.columns(self._batch), schema=self.schema))
+            self.rows += len(self._batch)
+            self._batch = []
+
+    def close(self):
+        self._flush()
+        self._writer.close()
+
+
+def save_run_outputs(args, rows, jobs=None, page_hashes=None, previous=None):
+    """Write the companies (and, if given, jobs) outputs, plus any requested
+    columnar exports. With a PreviousRun also write the .delta.jsonl change
+    files and the content-hash manifest. Returns the number of jobs written,
+    or None without jobs."""
+    company_delta = job_delta = None
+    if previous is not None:
+        company_delta = DeltaWriter(_delta_path(args.out_json), "company_url", previous.companies,
+                                    previous.manifest.get("companies"))
+        rows = company_delta.feed(rows)
+        if jobs is not None:
+            job_delta = DeltaWriter(_delta_path(args.jobs_json), "job_url", previous.jobs, previous.manifest.get("jobs"))
+            jobs = job_delta.feed(jobs)
+
+    columnar = []
+    if args.companies_parquet:
+        columnar.append(ColumnarWriter(args.companies_parquet, "companies"))
+        rows = columnar[-1].feed(rows)
+    if args.jobs_parquet and jobs is not None:
+        columnar.append(ColumnarWriter(args.jobs_parquet, "jobs"))
+        jobs = columnar[-1].feed(jobs)
+
+    total_jobs = None
+    if jobs is not None:
+        total_jobs = save_jobs_outputs(jobs, out_json=args.jobs_json, out_csv=args.jobs_csv)
+    save_outputs(rows, out_json=args.out_json, out_csv=args.out_csv)
+    for writer in columnar:
+        writer.close()
+        print(f"Wrote {writer.rows} rows to {writer.path}")
+
+    if previous is not None:
+        company_delta.close()
+        # Without a jobs pass the saved jobs and page hashes are last run's, and so is the filter key they were made with
+        manifest = {
+            "filters": previous.manifest.get("filters"),
+            "companies": company_delta.hashes,
+            "jobs": previous.manifest.get("jobs", {}),
+            "pages": previous.manifest.get("pages", {}),
+        }
+        print(f"Company changes: {company_delta.summary()} -> {_delta_path(args.out_json)}")
+        if job_delta is not None:
+            job_delta.close()
+            manifest["filters"] = _filters_from_args(args).key()
+            manifest["jobs"] = job_delta.hashes
+            manifest["pages"] = page_hashes or {}
+            print(f"Job changes: {job_delta.summary()} -> {_delta_path(args.jobs_json)}")
+        with open(args.manifest, "w") as f:
+            json.dump(manifest, f)
+    return total_jobs
 
-            apply_filters(driver)
+
+def _filters_from_args(args):
+    """Build JobFilters from --filter-config, with individual CLI flags taking precedence."""
+    config = {}
+    if args.filter_config:
+        with open(args.filter_config, "r") as f:
+            config = json.load(f)
+
+    if args.title_keywords is not None:
+        config["title_keywords"] = [k.strip() for k in args.title_keywords.split(",") if k.strip()]
+    if args.title_regex is not None:
+        config["title_regex"] = args.title_regex
+    if args.date_cutoff is not None:
+        config["date_cutoff"] = None if args.date_cutoff.lower() == "none" else args.date_cutoff
+    if args.locations is not None:
+        config["locations"] = [l.strip() for l in args.locations.split(",") if l.strip()]
+    if args.min_salary is not None:
+        config["min_salary"] = args.min_salary
+    if args.max_experience is not None:
+        config["max_experience"] = args.max_experience
+    return JobFilters.from_config(config)
+
+
+def _fetch_companies_from_args(args):
+    session = HttpSession()
+    app_id = args.api_app_id or os.environ.get("YC_ALGOLIA_APP_ID")
+    api_key = args.api_key or os.environ.get("YC_ALGOLIA_API_KEY")
+    if not api_key:
+        app_id, api_key = discover_algolia_opts(session)
+    app_id = app_id or YC_ALGOLIA_APP_ID
+    api_url = args.api_url or f"https://{app_id.lower()}-dsn.algolia.net/1/indexes/{args.api_index}/query"
+    return fetch_companies_api(session, api_url, app_id, api_key, workers=args.api_workers)
+
+
+def _load_or_scrape_companies(args):
+    # Check if we should load companies from file or scrape them
+    if os.path.exists(args.out_json) and (args.scrape_jobs or args.queue_role == "coordinator"):
+        # If jobs scraping is requested and companies.json exists, load it
+        with open(args.out_json, "r") as f:
+            rows = json.load(f)
+        print(f"Loaded {len(rows)} companies from {args.out_json}")
+        return rows
+
+    # Otherwise scrape companies
+    if args.source == "api":
+        rows = _fetch_companies_from_args(args)
+        print(f"Fetched {len(rows)} companies from the search API.")
+        return rows
+
+    if args.partition_by:
+        values = args.partitions.split(",") if args.partitions else _yc_batches()
+        return scrape_directory_partitioned(args, args.partition_by, [v.strip() for v in values if v.strip()])
+    return _scrape_directory(args, args.companies_url)
+
+
+def _scrape_directory(args, url, partition=None):
+    """Load one directory page on a fresh driver, apply the filters, scroll and parse the cards."""
+    driver = get_driver(headless=args.headless, profile=args.directory_profile)
+    try:
+        driver.get(url)
+        WebDriverWait(driver, 30).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+        wait_for_network_idle(driver, label="directory.page_idle")
+
+        apply_filters(driver)
+        if args.harvest:
+            rows = scroll_to_load_all(driver, timeout=args.timeout, pause=args.pause, harvest=True)
+        else:
             scroll_to_load_all(driver, timeout=args.timeout, pause=args.pause)
-            rows = parse_company_cards(driver)
-            print(f"Scraped {len(rows)} companies.")
-        finally:
-            driver.quit()
-    
+            rows = parse_company_cards(driver, mode=args.parse_mode)
+        if ARCHIVE is not None:
+            _capture(driver.current_url, "listing", driver.page_source)
+        print(f"Scraped {len(rows)} companies{f' for {partition}' if partition else ''}.")
+    finally:
+        driver.quit()
+    return rows
+
+
+def _yc_batches():
+    """Batch facet values from the first batch to next year's, newest first (e.g. "Summer 2025")."""
+    batches = []
+    for year in range(datetime.now().year + 1, 2004, -1):
+        if year >= 2025:
+            seasons = ["Fall", "Summer", "Spring", "Winter"]
+        elif year == 2024:
+            seasons = ["Fall", "Summer", "Winter"]
+        else:
+            seasons = ["Summer", "Winter"] if year > 2005 else ["Summer"]
+        batches.extend(f"{season} {year}" for season in seasons)
+    return batches
+
+
+def scrape_directory_partitioned(args, facet, values):
+    """Scrape the directory once per facet value, each on its own driver, and
+    merge the partitions in order, deduplicated by company_url.
+
+    Partitions run on an AdaptiveScheduler, so one that fails to load is
+    retried on its own with backoff while the others carry on.
+    """
+    results = {}
+    failed = []
+
+    def scrape(value):
+        url = f"{args.companies_url}{'&' if '?' in args.companies_url else '?'}{urlencode({facet: value})}"
+        try:
+            return _scrape_directory(args, url, partition=f"{facet}={value}")
+        except (TimeoutException, WebDriverException) as e:
+            raise TransientScrapeError(f"{facet}={value}: {e.__class__.__name__}") from e
+
+    def on_result(value, rows):
+        results[value] = rows
+
+    def on_error(value, e):
+        failed.append(value)
+        print(f"Partition {facet}={value} failed: {e}")
+
+    # Pinned at min == max: only the retry/backoff handling is wanted here. Empty
+    # partitions (old batches with no US hiring companies) are normal, not overload.
+    workers = max(1, min(args.partition_workers, len(values)))
+    scheduler = AdaptiveScheduler(workers, min_workers=workers, initial=workers, max_retries=args.max_retries,
+                                  backoff_base=args.backoff_base, backoff_max=args.backoff_max)
+    scheduler.run(values, scrape, on_result, on_error)
+
+    rows = []
+    seen = set()
+    for value in values:
+        for row in results.get(value, []):
+            if row.get("company_url") not in seen:
+                seen.add(row.get("company_url"))
+                rows.append(row)
+    print(f"Scraped {len(rows)} companies from {len(results)} of {len(values)} {facet} partitions")
+    if failed:
+        print(f"Failed partitions: {', '.join(failed)}")
+    return rows
+
+
+class JobStage:
+    """Everything the job stage needs for one process: driver pool, HTTP session,
+    detail fetcher, cache, filters and the adaptive scheduler. run() may be
+    called repeatedly (e.g. once per batch claimed from a WorkQueue)."""
+
+    def __init__(self, args, total=0, done=0, previous=None, store=None):
+        self.args = args
+        self.previous = previous
+        self.store = store
+        self.progress_counter = [done]
+        self.total = total
+        self.lock = Lock()
+        self.pool = DriverPool(args.workers, headless=args.headless, max_pages=args.driver_max_pages, profile=args.jobs_profile)
+        http_session = HttpSession() if args.engine == "http" or args.detail_fetch == "http" else None
+        self.session = http_session if args.engine == "http" else None
+        self.fetcher = None
+        if args.detail_fetch == "http":
+            self.fetcher = DetailFetcher(http_session, max_workers=max(args.detail_concurrency, args.workers * 2), per_host=args.detail_concurrency)
+        self.filters = _filters_from_args(args)
+        # A --capture run fetches every page, so nothing is served from the cache or the previous run
+        if ARCHIVE is not None:
+            self.previous = None
+        self.cache = None
+        if not args.no_detail_cache and ARCHIVE is None:
+            self.cache = DetailCache(args.detail_cache, ttl_days=args.detail_cache_ttl_days, max_entries=args.detail_cache_max_entries,
+                                     negative_ttl_days=args.detail_cache_negative_ttl_days)
+            if args.purge_detail_cache:
+                self.cache.purge()
+
+        # AIMD scheduler adjusts how many companies are in flight; each worker thread keeps one pooled driver
+        self.scheduler = AdaptiveScheduler(
+            self.pool.size,
+            min_workers=args.min_workers,
+            initial=args.initial_workers,
+            max_retries=args.max_retries,
+            backoff_base=args.backoff_base,
+            backoff_max=args.backoff_max,
+        )
+
+    def run(self, companies, on_result, on_error):
+        self.scheduler.run(
+            companies,
+            lambda company: scrape_jobs_worker(company, self.progress_counter, self.total, self.lock, self.pool,
+                                               self.session, self.fetcher, self.cache, self.filters, self.previous,
+                                               self.store),
+            on_result,
+            on_error,
+            is_empty=lambda result: result["rows_seen"] == 0,
+            latency_of=lambda result: result["load_seconds"],
+        )
+
+    def close(self):
+        print(f"Adaptive concurrency ended at {int(self.scheduler.limit)} of {self.pool.size} workers")
+        self.pool.close()
+        if self.fetcher is not None:
+            self.fetcher.close()
+        if self.cache is not None:
+            print(f"Detail cache: {self.cache.hits} hits, {self.cache.misses} misses")
+            self.cache.evict()
+            self.cache.close()
+        print(self.filters.summary())
+        if self.previous is not None:
+            print(f"Delta: {self.previous.reused} companies reused from the previous run")
+
+
+class WorkQueue:
+    """Durable SQLite queue of companies with leases, shared by any number of
+    worker processes on this host or on hosts that mount the same file.
+
+    A claimed company is leased to its worker until lease_expires; workers
+    renew their leases while busy, so a crashed worker's items become
+    claimable again once the lease runs out. Over a network filesystem open
+    with wal=False, since WAL needs shared memory on a single host.
+    """
+
+    def __init__(self, path, wal=True):
+        self.path = path
+        self._lock = Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=60, isolation_level=None)
+        self._conn.execute(f"PRAGMA journal_mode={'WAL' if wal else 'DELETE'}")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS companies ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " company_url TEXT UNIQUE NOT NULL,"
+            " payload TEXT NOT NULL,"
+            " status TEXT NOT NULL DEFAULT 'pending',"
+            " lease_owner TEXT,"
+            " lease_expires REAL,"
+            " attempts INTEGER NOT NULL DEFAULT 0,"
+            " error TEXT,"
+            " result TEXT)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS companies_status ON companies (status, lease_expires)")
+
+    def enqueue(self, companies):
+        """Add companies; ones already queued (in any state) are left alone. Returns how many were added."""
+        values = [(c["company_url"], json.dumps(c, default=_json_default)) for c in companies if c.get("company_url")]
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._conn.executemany("INSERT OR IGNORE INTO companies (company_url, payload) VALUES (?, ?)", values)
+            self._conn.execute("COMMIT")
+            return self._conn.total_changes - before
+
+    def reset(self):
+        """Drop every queued company, whatever its state. Returns how many were dropped."""
+        with self._lock:
+            return self._conn.execute("DELETE FROM companies").rowcount
+
+    def retry_failed(self):
+        """Return failed companies to the queue with a fresh attempt budget. Returns how many."""
+        with self._lock:
+            return self._conn.execute(
+                "UPDATE companies SET status = 'pending', attempts = 0, lease_owner = NULL, lease_expires = NULL"
+                " WHERE status = 'failed'"
+            ).rowcount
+
+    def claim(self, owner, lease_seconds, limit=1):
+        """Lease up to `limit` pending or expired companies to owner; returns their payloads."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._conn.execute(
+                    "SELECT id, payload FROM companies"
+                    " WHERE status = 'pending' OR (status = 'leased' AND lease_expires < ?)"
+                    " ORDER BY id LIMIT ?",
+                    (now, limit),
+                ).fetchall()
+                self._conn.executemany(
+                    "UPDATE companies SET status = 'leased', lease_owner = ?, lease_expires = ?,"
+                    " attempts = attempts + 1 WHERE id = ?",
+                    [(owner, now + lease_seconds, row_id) for row_id, _ in rows],
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return [json.loads(payload) for _, payload in rows]
+
+    def renew(self, owner, lease_seconds):
+        """Extend every lease owner still holds."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE companies SET lease_expires = ? WHERE status = 'leased' AND lease_owner = ?",
+                (time.time() + lease_seconds, owner),
+            )
+
+    def complete(self, company_url, owner, result):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE companies SET status = 'done', result = ?, error = NULL, lease_owner = ?"
+                " WHERE company_url = ? AND status != 'done'",
+                (json.dumps(result, default=_json_default), owner, company_url),
+            )
+
+    def fail(self, company_url, owner, error, max_attempts):
+        """Return a company to the queue, or mark it failed after max_attempts claims."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE companies SET error = ?,"
+                " status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END"
+                " WHERE company_url = ? AND status = 'leased' AND lease_owner = ?",
+                (error, max_attempts, company_url, owner),
+            )
+
+    def counts(self):
+        with self._lock:
+            return dict(self._conn.execute("SELECT status, COUNT(*) FROM companies GROUP BY status").fetchall())
+
+    def has_unfinished(self):
+        counts = self.counts()
+        return bool(counts.get("pending") or counts.get("leased"))
+
+    def iter_companies(self):
+        """Yield (company_row, result_or_None) in enqueue order."""
+        cur = self._conn.cursor()
+        cur.execute("SELECT payload, result FROM companies ORDER BY id")
+        for payload, result in cur:
+            yield json.loads(payload), (json.loads(result) if result else None)
+
+    def iter_jobs(self):
+        for _, result in self.iter_companies():
+            if result:
+                yield from result["jobs"]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def _open_queue(args):
+    return WorkQueue(args.queue_db, wal=not args.queue_shared_fs)
+
+
+def run_queue_worker(args):
+    """Claim companies from the queue and scrape them until nothing is left to do."""
+    queue = _open_queue(args)
+    owner = f"{socket.gethostname()}:{os.getpid()}"
+    counts = queue.counts()
+    stage = JobStage(args, total=sum(counts.values()), done=counts.get("done", 0), previous=_previous_from_args(args))
+    print(f"Worker {owner} started on {args.queue_db}: {counts}")
+
+    # Keep our leases alive while batches take longer than one lease period
+    stop = Event()
+
+    def heartbeat():
+        while not stop.wait(args.queue_lease / 3):
+            try:
+                queue.renew(owner, args.queue_lease)
+            except Exception as e:
+                print(f"Lease renewal failed: {e}")
+
+    beat = Thread(target=heartbeat, daemon=True)
+    beat.start()
+
+    def on_result(company, result):
+        queue.complete(company["company_url"], owner, result)
+
+    def on_error(company, e):
+        print(f"Error processing company {company.get('company_name')}: {e}")
+        queue.fail(company["company_url"], owner, str(e), args.queue_max_attempts)
+
+    try:
+        while True:
+            batch = queue.claim(owner, args.queue_lease, limit=args.workers * 2)
+            if not batch:
+                # Others may still crash and leave expired leases behind; wait them out
+                if not queue.has_unfinished():
+                    break
+                time.sleep(min(5.0, args.queue_lease / 4))
+                continue
+            stage.run(batch, on_result, on_error)
+    finally:
+        stop.set()
+        stage.close()
+        queue.close()
+    print(f"Worker {owner} finished")
+
+
+def merge_queue(args):
+    """Write the usual companies/jobs outputs from everything the queue has completed."""
+    previous = _previous_from_args(args)
+    queue = _open_queue(args)
+    try:
+        store = RecordStore()
+        page_hashes = {}
+        for company, result in queue.iter_companies():
+            record = store.add_company(company)
+            if result:
+                record.job_count = result["job_count"]
+                if result.get("page_hash"):
+                    page_hashes[record.company_url] = result["page_hash"]
+        total_jobs = save_run_outputs(args, store.iter_companies(), queue.iter_jobs(), page_hashes, previous)
+        counts = queue.counts()
+    finally:
+        queue.close()
+    print(f"Merged {total_jobs} jobs from {len(store)} companies ({counts})")
+
+
+def _previous_from_args(args):
+    """PreviousRun over the current outputs when --delta is set, else None."""
+    if not args.delta:
+        return None
+    return PreviousRun(args.manifest, args.out_json, args.jobs_json, _filters_from_args(args).key())
+
+
+def _worker_argv():
+    """This process's command line with --queue-role switched to worker."""
+    argv = []
+    skip = False
+    for a in sys.argv[1:]:
+        if skip:
+            skip = False
+            continue
+        if a == "--queue-role":
+            skip = True
+            continue
+        if a.startswith("--queue-role="):
+            continue
+        argv.append(a)
+    return [sys.executable, os.path.abspath(__file__), *argv, "--queue-role", "worker"]
+
+
+def run_queue_coordinator(args, rows):
+    """Enqueue companies, run local worker processes, then merge their results.
+
+    The queue starts empty unless --resume is given, in which case companies
+    an earlier run completed are kept and failed ones are tried again.
+    """
+    queue = _open_queue(args)
+    try:
+        if args.resume:
+            retried = queue.retry_failed()
+            if retried:
+                print(f"Retrying {retried} companies that failed in {args.queue_db}")
+        else:
+            cleared = queue.reset()
+            if cleared:
+                print(f"Cleared {cleared} companies left in {args.queue_db} by an earlier run (use --resume to continue it)")
+        added = queue.enqueue(rows)
+        counts = queue.counts()
+        print(f"Enqueued {added} new companies into {args.queue_db} ({counts})")
+        if counts.get("done"):
+            print(f"Resuming: skipping {counts['done']} companies already completed in {args.queue_db}")
+    finally:
+        queue.close()
+
+    if args.queue_procs <= 0:
+        print("No local workers requested; start workers with --queue-role worker and merge with --queue-role merge")
+        return
+
+    procs = [subprocess.Popen(_worker_argv()) for _ in range(args.queue_procs)]
+    for p in procs:
+        p.wait()
+    merge_queue(args)
+
+
+def main():
+    global ARCHIVE
+    parser = argparse.ArgumentParser(description="Scrape YC companies with 'Is Hiring' and 'USA' filters.",
+                                     epilog="Search saved jobs with: script.py query --help")
+    parser.add_argument("--headless", action="store_true", help="Run Chrome headless.")
+    parser.add_argument("--timeout", type=int, default=180)
+    parser.add_argument("--pause", type=float, default=2.0)
+    parser.add_argument("--companies-url", default=YC_COMPANIES_URL, help="Company directory page to scrape")
+    parser.add_argument("--source", choices=["browser", "api"], default="browser", help="Collect the company directory by scrolling in Chrome or from the site's search API")
+    parser.add_argument("--api-url", help="Search API query endpoint (defaults to the YC Algolia index; point at a stub server for testing)")
+    parser.add_argument("--api-app-id", help="Search API application id (or YC_ALGOLIA_APP_ID)")
+    parser.add_argument("--api-key", help="Search-only API key (or YC_ALGOLIA_API_KEY); discovered from the page if unset")
+    parser.add_argument("--api-index", default=YC_ALGOLIA_INDEX)
+    parser.add_argument("--api-workers", type=int, default=8, help="Concurrent search API page requests")
+    parser.add_argument("--partition-by", choices=["batch", "industry"], help="Scrape the directory as one filtered page per facet value, in parallel, and merge the results")
+    parser.add_argument("--partitions", help="Comma-separated facet values for --partition-by (default for batch: every batch)")
+    parser.add_argument("--partition-workers", type=int, default=4, help="Drivers scraping partitions at once")
+    parser.add_argument("--harvest", action="store_true", help="Collect cards incrementally while scrolling instead of re-reading the whole list each iteration")
+    parser.add_argument("--parse-mode", choices=["js", "webdriver"], default="js", help="Extract company cards with one in-page script or per-element WebDriver calls")
+    parser.add_argument("--out-json", default="companies.json")
+    parser.add_argument("--out-csv", default="companies.csv")
+    parser.add_argument("--jobs-json", default="jobs.json")
+    parser.add_argument("--jobs-csv", default="jobs.csv")
+    parser.add_argument("--scrape-jobs", action="store_true", help="Also scrape jobs for each company")
+    parser.add_argument("--workers", type=int, default=5, help="Number of parallel workers (and pooled drivers) for job scraping")
+    parser.add_argument("--engine", choices=["selenium", "http"], default="selenium", help="Job page engine: full Chrome, or plain HTTP with Selenium fallback")
+    parser.add_argument("--detail-fetch", choices=["http", "tab"], default="http", help="Read job datePosted via concurrent HTTP requests or one browser tab per job")
+    parser.add_argument("--detail-concurrency", type=int, default=8, help="Max concurrent job detail requests per host")
+    parser.add_argument("--detail-cache", default="job_details.sqlite", help="SQLite cache of job datePosted values")
+    parser.add_argument("--no-detail-cache", action="store_true", help="Bypass the job detail cache for this run")
+    parser.add_argument("--purge-detail-cache", action="store_true", help="Empty the job detail cache before scraping")
+    parser.add_argument("--detail-cache-ttl-days", type=float, default=30)
+    parser.add_argument("--detail-cache-max-entries", type=int, default=200_000)
+    parser.add_argument("--detail-cache-negative-ttl-days", type=float, default=1, help="How long a job page without a datePosted is remembered before it is fetched again")
+    parser.add_argument("--filter-config", help="JSON file with job filters (title_keywords, title_regex, date_cutoff, locations, min_salary, max_experience)")
+    parser.add_argument("--title-keywords", help="Comma-separated title keywords, any of which must match (empty string disables)")
+    parser.add_argument("--title-regex", help="Regex the job title must match")
+    parser.add_argument("--date-cutoff", help="Drop jobs posted before this date, e.g. 2025-08-04 ('none' disables)")
+    parser.add_argument("--locations", help="Comma-separated location substrings, any of which must match")
+    parser.add_argument("--min-salary", type=float, help="Drop jobs whose top of salary range is below this amount")
+    parser.add_argument("--max-experience", type=int, help="Drop jobs requiring more than this many years")
+    parser.add_argument("--checkpoint", default="jobs.checkpoint.jsonl", help="JSONL file each finished company's jobs are appended to")
+    parser.add_argument("--resume", action="store_true", help="Skip companies already in --checkpoint (or, as queue coordinator, already done in --queue-db) instead of starting over")
+    parser.add_argument("--directory-profile", choices=DRIVER_PROFILES, default="full", help="Chrome page-load profile for the company directory stage")
+    parser.add_argument("--jobs-profile", choices=DRIVER_PROFILES, default="lean", help="Chrome page-load profile for the job scraping stage")
+    parser.add_argument("--min-workers", type=int, default=1, help="Lower bound for adaptive job-scraping concurrency")
+    parser.add_argument("--initial-workers", type=int, help="Starting concurrency (default: half of --workers)")
+    parser.add_argument("--max-rps", type=float, default=0.0,
+                        help="Page loads (listing, API and /jobs pages) per second per host; 0 (default) disables. "
+                             "The adaptive scheduler already backs off on 429s, 5xx and slow pages, so a ceiling only "
+                             "helps when the site's safe rate is known; it also caps throughput at that rate "
+                             "however many --workers run")
+    parser.add_argument("--max-detail-rps", type=float, default=0.0,
+                        help="Job detail-page fetches per second per host, counted separately from --max-rps; 0 (default) disables")
+    parser.add_argument("--max-retries", type=int, default=3, help="Retries for transient page-load failures")
+    parser.add_argument("--backoff-base", type=float, default=2.0, help="Base delay in seconds for jittered exponential backoff")
+    parser.add_argument("--backoff-max", type=float, default=60.0)
+    parser.add_argument("--queue-role", choices=["coordinator", "worker", "merge"], help="Shard job scraping through a durable SQLite work queue")
+    parser.add_argument("--queue-db", default="jobs_queue.sqlite", help="Work queue database (may live on a filesystem shared by several hosts)")
+    parser.add_argument("--queue-procs", type=int, default=2, help="Worker processes the coordinator starts on this host (0 = enqueue only)")
+    parser.add_argument("--queue-lease", type=float, default=300.0, help="Seconds a claimed company stays leased without renewal")
+    parser.add_argument("--queue-max-attempts", type=int, default=3, help="Claims per company before it is marked failed")
+    parser.add_argument("--queue-shared-fs", action="store_true", help="Use a rollback journal instead of WAL (required on network filesystems)")
+    parser.add_argument("--jobs-parquet", metavar="PATH", help="Also write jobs with typed salary, experience, location and date columns (.parquet, or .arrow/.feather for Arrow IPC)")
+    parser.add_argument("--companies-parquet", metavar="PATH", help="Also write companies with city/state/country columns (.parquet, or .arrow/.feather)")
+    parser.add_argument("--delta", action="store_true", help="Compare with the previous outputs: write added/changed/removed records to *.delta.jsonl and reuse jobs for companies whose /jobs page is unchanged")
+    parser.add_argument("--manifest", default="manifest.json", help="Content-hash manifest read and written by --delta")
+    parser.add_argument("--capture", metavar="ARCHIVE", help="Store the raw HTML of every listing, /jobs and job detail page in this archive")
+    parser.add_argument("--reparse", metavar="ARCHIVE", help="Rebuild outputs from a --capture archive without a browser, then exit")
+    parser.add_argument("--reparse-procs", type=int, help="Processes for --reparse (default: CPU count)")
+    parser.add_argument("--driver-max-pages", type=int, default=50, help="Recycle a pooled driver after this many companies")
+    parser.add_argument("--wait-poll", type=float, default=0.1, help="Seconds between checks while waiting on page conditions")
+    parser.add_argument("--wait-quiet", type=float, default=0.5, help="Seconds without network activity that count as idle")
+    parser.add_argument("--wait-timeout", type=float, default=10.0, help="Default upper bound for a single page wait")
+    parser.add_argument("--metrics-file", help="Write Prometheus text-format metrics here when the run ends")
+    parser.add_argument("--metrics-port", type=int, help="Serve Prometheus metrics on this port at /metrics during the run")
+    parser.add_argument("--trace-json", help="Write a Chrome trace-event JSON of every instrumented stage call")
+    args = parser.parse_args()
+    if args.min_workers < 1:
+        parser.error("--min-workers must be at least 1")
+    if args.partition_by == "industry" and not args.partitions:
+        parser.error("--partition-by industry needs --partitions")
+    if (args.jobs_parquet or args.companies_parquet) and pa is None:
+        parser.error("--jobs-parquet/--companies-parquet need pyarrow (pip install pyarrow)")
+
+    # Written at exit so failed runs still leave metrics behind
+    if args.metrics_file:
+        atexit.register(METRICS.write_prometheus, args.metrics_file)
+    if args.trace_json:
+        METRICS.enable_trace()
+        atexit.register(METRICS.write_trace, args.trace_json)
+    if args.metrics_port:
+        METRICS.serve(args.metrics_port)
+
+    RATE_LIMITER.rps = {"page": args.max_rps, "detail": args.max_detail_rps}
+    WAITS.poll = args.wait_poll
+    WAITS.quiet = args.wait_quiet
+    WAITS.timeout = args.wait_timeout
+
+    if args.reparse:
+        reparse_archive(args)
+        return
+    if args.capture:
+        ARCHIVE = SnapshotArchive(args.capture)
+        atexit.register(ARCHIVE.close)
+
+    if args.queue_role == "worker":
+        run_queue_worker(args)
+        return
+    if args.queue_role == "merge":
+        merge_queue(args)
+        return
+
+    # Index last run's outputs before anything overwrites them
+    previous = _previous_from_args(args)
+    store = RecordStore().add_companies(_load_or_scrape_companies(args))
+    if ARCHIVE is not None:
+        # Job-only and API runs never capture a listing page; keep the company list reparse should use
+        _capture(args.companies_url, "companies", json.dumps(list(store.iter_companies()), default=_json_default))
+
     # Scrape jobs if requested
-    all_jobs = []
+    if args.queue_role == "coordinator":
+        run_queue_coordinator(args, list(store.iter_companies()))
+        return
     if args.scrape_jobs:
-        print(f"\nStarting to scrape jobs for {len(rows)} companies using {args.workers} workers...")
-        
-        progress_counter = [0]
-        lock = Lock()
-        
-        # Use ThreadPoolExecutor for parallel scraping
-        with ThreadPoolExecutor(max_workers=args.workers) as executor:
-            futures = {
-                executor.submit(scrape_jobs_worker, company, progress_counter, len(rows), lock, args.headless): company
-                for company in rows if company.get("company_url")
-            }
-            
-            for future in as_completed(futures):
-                try:
-                    result = future.result()
-                    company_name = result["company_name"]
-                    job_count = result["job_count"]
-                    jobs = result["jobs"]
-                    
-                    # Update company with job count
-                    for company in rows:
-                        if company.get("company_name") == company_name:
-                            company["job_count"] = job_count
-                            break
-                    
-                    all_jobs.extend(jobs)
-                except Exception as e:
-                    print(f"Error processing company: {e}")
-        
-        print(f"\nTotal jobs scraped: {len(all_jobs)}")
-        save_jobs_outputs(all_jobs, out_json=args.jobs_json, out_csv=args.jobs_csv)
+        checkpoint = JobCheckpoint(args.checkpoint, resume=args.resume)
+        pending = [c for c in store.iter_companies() if c.company_url and c.company_url not in checkpoint.completed]
+        if checkpoint.completed:
+            print(f"Resuming: {len(checkpoint.completed)} companies already in {args.checkpoint}")
+        print(f"\nStarting to scrape jobs for {len(pending)} companies using {args.workers} workers...")
+
+        def on_result(company, result):
+            # Persist each company as soon as it finishes so a crash loses nothing
+            checkpoint.append(result)
+
+        def on_error(company, e):
+            print(f"Error processing company {company.get('company_name')}: {e}")
+
+        stage = JobStage(args, total=len(store), done=len(checkpoint.completed), previous=previous, store=store)
+        try:
+            stage.run(pending, on_result, on_error)
+        finally:
+            checkpoint.close()
+            stage.close()
+
+        # Final compaction: stream the checkpoint into the usual outputs
+        page_hashes = {}
+        for result in checkpoint.iter_results():
+            # Covers companies finished by an earlier, resumed run too
+            store.set_job_count(result["company_url"], result["job_count"])
+            if result.get("page_hash"):
+                page_hashes[result["company_url"]] = result["page_hash"]
+        total_jobs = save_run_outputs(args, store.iter_companies(), checkpoint.iter_jobs(), page_hashes, previous)
+        print(f"\nTotal jobs scraped: {total_jobs}")
     else:
-        for company in rows:
-            company["job_count"] = 0
+        for company in store.iter_companies():
+            company.job_count = 0
+        save_run_outputs(args, store.iter_companies(), previous=previous)
     
-    save_outputs(rows, out_json=args.out_json, out_csv=args.out_csv)
+    print(WAITS.stats.summary())
 
 
 if __name__ == "__main__":